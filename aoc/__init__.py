@@ -0,0 +1 @@
+# This file is just to make pylint happy.
@@ -0,0 +1,7 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+from aoc import runner
+
+
+if __name__ == '__main__':
+    runner.main()
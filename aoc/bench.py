@@ -0,0 +1,286 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import gc
+import json
+import os
+import sys
+import time
+
+from aoc.lazy import lazy_import
+from aoc.runner import ROOT, generate_input, import_day_module
+
+# Only needed when the suite runs, not to know its command line.
+platform = lazy_import('platform')
+tempfile = lazy_import('tempfile')
+
+
+BASELINES_FILE = os.path.join(ROOT, 'benchmarks', 'baselines.json')
+
+# A case is slower than its baseline if it takes this percentage more.
+DEFAULT_THRESHOLD = 25
+
+# Nor is it if it takes less than these seconds more, which is just noise.
+DEFAULT_NOISE_FLOOR = 0.005
+
+# Timed runs of each case, of which the fastest one counts.
+DEFAULT_REPEAT = 10
+
+# Rows of day 15 part 2 scanned by its case, out of millions.
+TUNING_ROWS = 3000
+
+
+class Case:
+    """A public function of a day, benchmarked at several input sizes
+
+    `prepare(module, input_file, size)` does everything that is not to
+    be timed, and returns a function with no arguments that does what is
+    to be timed. It is called before every timed run, because many of the
+    functions consume generators or modify their arguments.
+
+    Inputs are generated with the generator of the day, of each of the
+    `sizes`, unless `generated` is false, in which case the input of the
+    day is used for all the sizes and it is up to `prepare()` to do with
+    `size` whatever makes sense for the function.
+    """
+
+    def __init__(self, day, module, func, prepare, sizes, generated=True):
+        self.day = day
+        self.module = module
+        self.func = func
+        self.prepare = prepare
+        self.sizes = sizes
+        self.generated = generated
+
+    def name(self, size):
+        return 'day_%02d.%s.%s[%d]' % (self.day, self.module, self.func, size)
+
+
+def _case(day, module, func, sizes, reader=None, prepare=None, **kwargs):
+    if prepare is None:
+        def prepare(module_, input_file, size):
+            f = getattr(module_, func)
+            if reader is None:  # The function reads the file itself.
+                return lambda: f(input_file)
+            read = getattr(module_, reader)
+            return lambda: f(read(input_file))
+    return Case(day, module, func, prepare, sizes, **kwargs)
+
+
+def _prepare_process_items(module, input_file, size):
+    """Process `size` rounds of part 2, with the worry relaxed as there"""
+    monkeys = module.Monkeys()
+    monkeys.build_from_file(input_file)
+    divisor = 1
+    for monkey in monkeys:
+        divisor *= monkey.divisible_by
+    return lambda: monkeys.process_items(
+        num_rounds=size, relax_func=lambda worry_level: worry_level % divisor)
+
+
+def _prepare_score_file(module, input_file, size):
+    """Score the file from the table of the part, as its `solve` does"""
+    return lambda: module.score_file(input_file, module.SCORE_TABLE)
+
+
+def _prepare_tuning_frequency(module, input_file, size):
+    """Scan the first rows of part 2, among `size` sensors
+
+    The whole part 2 scans the rows for minutes, up to the one with the
+    distress signal, so this scans just the first `TUNING_ROWS`, which
+    the signal of the generated inputs is way below.
+    """
+    circles, _ = module.load_circles_beacons(input_file)
+    return lambda: module.get_tuning_frequency(
+        circles=circles,
+        x_domain=(0, 4000000),
+        y_domain=(0, TUNING_ROWS - 1))
+
+
+CASES = [
+    _case(1, 'part_1', 'get_max_calories', [30000, 100000],
+          reader='get_calories_data'),
+    _case(2, 'part_1', 'get_total_score', [300000, 1000000],
+          reader='get_plays_data'),
+    _case(2, 'part_2', 'get_total_score', [300000, 1000000],
+          reader='get_plays_data'),
+    Case(2, 'part_1', 'score_file', _prepare_score_file, [1000000, 3000000]),
+    Case(2, 'part_2', 'score_file', _prepare_score_file, [1000000, 3000000]),
+    _case(3, 'part_2', 'get_sum_of_badges', [30000, 100000],
+          reader='get_rucksacks_data'),
+    _case(4, 'part_2', 'get_num_of_overlaps', [30000, 100000],
+          reader='get_ranges_data'),
+    _case(4, 'part_1', 'solve', [100000, 300000]),
+    _case(4, 'part_2', 'solve', [100000, 300000]),
+    _case(5, 'part_1', 'get_tops', [10000, 30000], reader='get_lines'),
+    _case(5, 'part_2', 'get_tops', [10000, 30000], reader='get_lines'),
+    _case(5, 'part_1', 'solve', [20000, 100000]),
+    _case(5, 'part_2', 'solve', [20000, 100000]),
+    _case(6, 'part_1', 'get_num_chars_to_process', [1000000, 3000000],
+          reader='get_lines'),
+    _case(6, 'part_2', 'get_num_chars_to_process', [1000000, 3000000],
+          reader='get_lines'),
+    _case(7, 'part_1_2', 'build_fs', [3000, 10000], reader='get_lines'),
+    _case(8, 'part_1', 'get_num_trees_seen', [300, 600]),
+    _case(8, 'part_2', 'get_highest_scenic_score', [200, 400],
+          reader='get_lines'),
+    _case(10, 'part_2', 'compute_crt', [100000, 300000],
+          reader='get_instruction_lines'),
+    Case(11, 'monkeys', 'Monkeys.process_items', _prepare_process_items,
+         [500, 2000], generated=False),
+    _case(13, 'part_1_2', 'part_2', [1000, 3000],
+          reader='get_pairs_of_lists'),
+    Case(15, 'part_1_2', 'get_tuning_frequency', _prepare_tuning_frequency,
+         [30, 100]),
+]
+
+
+def run_case(case, size, input_file, repeat):
+    """Time a case `repeat` times and return the fastest run, in seconds
+
+    Whatever else the machine does can only make a run slower, never
+    faster, so the fastest run is the one closest to the actual cost.
+    The garbage collector is off while timing, as `timeit` does, or
+    its collections would land on whichever run allocates the most.
+    """
+    module = import_day_module(case.day, case.module)
+    times = []
+    for _ in range(repeat):
+        func = case.prepare(module, input_file, size)
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return min(times)
+
+
+def run_suite(cases, repeat=DEFAULT_REPEAT, seed=0, log=None):
+    """Run all the cases at all their sizes, returning {name: seconds}
+
+    The runs are made in `repeat` rounds of all the cases, instead of
+    all the runs of a case in a row, so that the fastest run of each one
+    is among runs spread over the whole suite: the machine can be slower
+    for a fraction of a second, which would spoil runs in a row alike.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        runs = []
+        for case in cases:
+            for size in case.sizes:
+                if case.generated:
+                    input_file = os.path.join(
+                        tmp_dir, 'day_%02d_%d.txt' % (case.day, size))
+                    if not os.path.exists(input_file):
+                        generate_input(case.day, size, input_file, seed=seed)
+                else:
+                    input_file = os.path.join(
+                        ROOT, 'day_%02d' % case.day, 'inputs', 'part_1_2.txt')
+                runs.append((case, size, input_file))
+        for num_round in range(repeat):
+            for case, size, input_file in runs:
+                name = case.name(size)
+                seconds = run_case(case, size, input_file, 1)
+                results[name] = min(results.get(name, seconds), seconds)
+                # The times are only final in the last round.
+                if log and num_round == repeat - 1:
+                    log('%-60s %10.4f s' % (name, results[name]))
+    return results
+
+
+def load_baselines(path=BASELINES_FILE):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baselines(results, path=BASELINES_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cases': results,
+        }, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(results, baselines, threshold=DEFAULT_THRESHOLD,
+            noise_floor=DEFAULT_NOISE_FLOOR):
+    """Return the (name, baseline, current) of the regressed cases
+
+    A case regresses if it is more than `threshold` percent slower than
+    its baseline, and also more than `noise_floor` seconds slower, so
+    that the cases of a few milliseconds do not fail on noise. Cases
+    without a baseline are not regressions, they are just new.
+    """
+    regressions = []
+    for name, current in sorted(results.items()):
+        baseline = baselines['cases'].get(name)
+        if baseline is None:
+            continue
+        limit = max(baseline * (1 + threshold / 100), baseline + noise_floor)
+        if current > limit:
+            regressions.append((name, baseline, current))
+    return regressions
+
+
+def select_cases(patterns):
+    """Cases whose names contain any of the patterns, or all of them"""
+    if not patterns:
+        return CASES
+    return [
+        c for c in CASES
+        if any(p in c.name(size) for p in patterns for size in c.sizes)
+    ]
+
+
+def cmd_bench(args):
+    cases = select_cases(args.cases)
+    results = run_suite(cases, repeat=args.repeat, log=print)
+
+    if args.update:
+        baselines = {'cases': {}}
+        if os.path.exists(args.baselines):
+            baselines = load_baselines(args.baselines)
+        baselines['cases'].update(results)
+        save_baselines(baselines['cases'], args.baselines)
+        print('Baselines updated in %s' % os.path.relpath(args.baselines))
+        return
+
+    regressions = compare(
+        results, load_baselines(args.baselines), args.threshold,
+        args.noise_floor)
+    for name, baseline, current in regressions:
+        print('REGRESSION %s: %.4f s -> %.4f s (+%.0f%%)' % (
+            name, baseline, current, (current / baseline - 1) * 100))
+    if regressions:
+        sys.exit(1)
+    print('No case is more than %g%% slower than its baseline.' %
+          args.threshold)
+
+
+def add_parser(commands):
+    bench = commands.add_parser(
+        'bench', help='Run the benchmark suite against the baselines.')
+    bench.set_defaults(func=cmd_bench)
+    bench.add_argument(
+        'cases', nargs='*',
+        help='Run only the cases whose name contains any of these, '
+             'e.g. `day_05` or `get_tops`.')
+    bench.add_argument(
+        '-t', '--threshold', type=float, default=DEFAULT_THRESHOLD,
+        help='Fail if any case is more than this percentage slower.')
+    bench.add_argument(
+        '-f', '--noise-floor', type=float, default=DEFAULT_NOISE_FLOOR,
+        help='Unless it is less than this many seconds slower.')
+    bench.add_argument(
+        '-r', '--repeat', type=int, default=DEFAULT_REPEAT,
+        help='Timed runs per case and size, of which the fastest counts.')
+    bench.add_argument(
+        '--baselines', default=BASELINES_FILE,
+        help='File with the baselines, in JSON.')
+    bench.add_argument(
+        '--update', action='store_true',
+        help='Store the timings as the new baselines instead of comparing.')
@@ -0,0 +1,159 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import glob
+import hashlib
+import json
+import os
+
+
+DEFAULT_MAX_BYTES = 16 * 2**20
+
+
+def _write_atomically(path, data):
+    """Write the file at once, as several processes may share the cache"""
+    tmp_path = '%s.%d.tmp' % (path, os.getpid())
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _hash_and_count(path):
+    """Hash the file and count its lines and bytes, in a single read"""
+    digest = hashlib.sha256()
+    num_lines = 0
+    num_bytes = 0
+    block = b''
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+            num_lines += block.count(b'\n')
+            num_bytes += len(block)
+    # A last line without a trailing newline is still a line.
+    if num_bytes and not block.endswith(b'\n'):
+        num_lines += 1
+    return [digest.hexdigest(), num_lines, num_bytes]
+
+
+class AnswerCache:
+    """On-disk cache of answers, addressed by their content
+
+    An answer is stored under the hash of the bytes of the input, the
+    hash of the source code of the solver and the parameters given to
+    it, so changing any of them simply misses the cache and nothing ever
+    needs to be invalidated. Each answer is a small JSON file, and when
+    all of them take more than `max_bytes` the least recently used ones
+    are removed (a hit updates the modification time of the file).
+
+    Hashing the whole input would take as long as reading it, so the
+    hash of each input is also remembered by path, size and modification
+    time, and recomputed only when any of those change. So are its
+    numbers of lines and bytes, counted while hashing it, for the report
+    of a hit not to read the input either.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self._dir = directory
+        self._max_bytes = max_bytes
+        self._digests_path = os.path.join(directory, 'digests.json')
+        self._digests = None
+        self._solver_digests = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, solver, input_file, params):
+        """Return (True, answer) on a hit, (False, None) on a miss"""
+        path = self._entry_path(solver, input_file, params)
+        try:
+            with open(path) as f:
+                answer = json.load(f)
+        except (OSError, ValueError):
+            return False, None
+        os.utime(path)  # Now it is the most recently used.
+        return True, answer
+
+    def put(self, solver, input_file, params, answer):
+        path = self._entry_path(solver, input_file, params)
+        _write_atomically(path, answer)
+        self._evict()
+
+    def _entry_path(self, solver, input_file, params):
+        key = hashlib.sha256()
+        key.update(self._input_digest(input_file).encode())
+        key.update(self._solver_digest(solver).encode())
+        key.update(solver.module_name.encode())
+        key.update(solver.func_name.encode())
+        key.update(json.dumps(params, sort_keys=True).encode())
+        return os.path.join(self._dir, '%s.json' % key.hexdigest())
+
+    def input_size(self, input_file):
+        """Return the number of lines and bytes of the input file"""
+        _, num_lines, num_bytes = self._input_info(input_file)
+        return num_lines, num_bytes
+
+    def _input_digest(self, input_file):
+        return self._input_info(input_file)[0]
+
+    def _input_info(self, input_file):
+        """The hash, lines and bytes of the input, hashed only once"""
+        if self._digests is None:
+            try:
+                with open(self._digests_path) as f:
+                    self._digests = json.load(f)
+            except (OSError, ValueError):
+                self._digests = {}
+
+        input_file = os.path.abspath(input_file)
+        st = os.stat(input_file)
+        stamp = '%s|%d|%d|%d' % (
+            input_file, st.st_ino, st.st_size, st.st_mtime_ns)
+        info = self._digests.get(stamp)
+        # Older caches kept only the hash, so those are hashed again.
+        if not isinstance(info, list):
+            info = _hash_and_count(input_file)
+            # Forget the hashes of the previous versions of the file.
+            for old_stamp in list(self._digests):
+                if old_stamp.startswith(input_file + '|'):
+                    del self._digests[old_stamp]
+            self._digests[stamp] = info
+            _write_atomically(self._digests_path, self._digests)
+        return info
+
+    def _solver_digest(self, solver):
+        """Hash the sources of the day and of the code shared by all days
+
+        The solver may use its sibling modules and the shared ones, so
+        all of them count as the version of the solver.
+        """
+        if solver.day_dir in self._solver_digests:
+            return self._solver_digests[solver.day_dir]
+        digest = hashlib.sha256()
+        shared_dir = os.path.dirname(os.path.abspath(__file__))
+        for source_dir in (solver.day_dir, shared_dir):
+            for path in sorted(glob.glob(os.path.join(source_dir, '*.py'))):
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+        self._solver_digests[solver.day_dir] = digest.hexdigest()
+        return self._solver_digests[solver.day_dir]
+
+    def _evict(self):
+        """Remove the least recently used answers until under the limit"""
+        entries = []
+        total_bytes = 0
+        for path in glob.glob(os.path.join(self._dir, '*.json')):
+            if path == self._digests_path:
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:  # Removed by another process meanwhile.
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+            total_bytes += st.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_bytes <= self._max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total_bytes -= size
@@ -0,0 +1,32 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """Import a module the first time one of its attributes is used
+
+    Some modules (e.g. `asyncio` or `inspect`) take longer to import than
+    most solvers take to run, and are needed by just some commands, so
+    they are imported like this at the top of the module instead of in
+    each function that uses them. A module already imported is returned
+    as is.
+
+    >>> colorsys = lazy_import('colorsys')
+    >>> type(colorsys).__name__
+    '_LazyModule'
+    >>> colorsys.rgb_to_hsv(1, 0, 0)
+    (0.0, 1.0, 1)
+    >>> lazy_import('sys') is sys
+    True
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,95 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import contextlib
+import mmap
+
+
+# Size of the blocks of whole lines that are split at once.
+BLOCK_SIZE = 1 << 20
+
+NEWLINE = b'\n'
+
+
+@contextlib.contextmanager
+def mapped(source_file):
+    """Memory-map a file for reading
+
+    Empty files cannot be memory-mapped, so for those we give an empty
+    buffer instead, which behaves the same for our purposes.
+    """
+    with open(source_file, 'rb') as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file.
+            yield b''
+            return
+        with buf:
+            yield buf
+
+
+def iter_blocks(buf, start=0, end=None, block_size=BLOCK_SIZE):
+    """Yield the (start, end) offsets of blocks of whole lines in `buf`
+
+    Each block spans about `block_size` bytes and never cuts a line, and
+    the newline ending the block is left out. Lines longer than a block
+    make a block on their own.
+
+    >>> list(iter_blocks(b'ab\\ncd\\nef\\n', block_size=4))
+    [(0, 2), (3, 5), (6, 8)]
+    >>> list(iter_blocks(b'ab\\ncd\\nef', block_size=7))
+    [(0, 5), (6, 8)]
+    """
+    end = len(buf) if end is None else end
+    while start < end:
+        block_end = start + block_size
+        if block_end >= end:
+            block_end = end
+            if buf[end - 1:end] == NEWLINE:
+                block_end -= 1
+        else:
+            # Cut at the last newline in the block, or at the first one
+            # after the block if the line is longer than the block.
+            block_end = buf.rfind(NEWLINE, start, block_end + 1)
+            if block_end < 0:
+                block_end = buf.find(NEWLINE, start + block_size, end)
+                if block_end < 0:
+                    block_end = end
+        yield start, block_end
+        start = block_end + 1
+
+
+def iter_line_offsets(buf, start=0, end=None):
+    """Yield the (start, end) offsets of each line in `buf`
+
+    Nothing is copied, so this is the way to go when the caller can work
+    directly on the buffer, e.g. with `buf.startswith(prefix, start)`.
+
+    >>> list(iter_line_offsets(b'ab\\n\\ncd'))
+    [(0, 2), (3, 3), (4, 6)]
+    """
+    end = len(buf) if end is None else end
+    find = buf.find
+    while start < end:
+        line_end = find(NEWLINE, start, end)
+        if line_end < 0:
+            line_end = end
+        yield start, line_end
+        start = line_end + 1
+
+
+def iter_lines(source_file, start=0, end=None):
+    """Yield each line of the file as bytes, without the newline
+
+    This is the drop-in replacement for opening the file in text mode
+    and doing `line.rstrip(os.linesep)` on each line: the file is never
+    decoded, and the only objects created are the lines themselves.
+    Lines are split a block at a time, which is way faster than finding
+    each newline from Python. Only the lines between the offsets `start`
+    and `end` are yielded, which must be at the beginning of a line.
+    """
+    with mapped(source_file) as buf:
+        for block_start, block_end in iter_blocks(buf, start, end):
+            if block_start == block_end:  # A block that is an empty line.
+                yield b''
+            else:
+                yield from buf[block_start:block_end].split(NEWLINE)
@@ -0,0 +1,124 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import functools
+import itertools
+import os
+
+from aoc.lines import BLOCK_SIZE, NEWLINE, mapped
+
+
+# Records of most days are lines, but those of day 01 are groups of
+# lines ended by a blank line.
+BLANK_LINE = NEWLINE * 2
+
+
+def split_records(buf, num_chunks, separator=NEWLINE):
+    """Offsets (start, end) of about `num_chunks` chunks of whole records
+
+    Each chunk but the last one ends right after a separator, so records
+    are never cut, and chunks are about the same size unless records are
+    larger than the chunks, in which case there are fewer of them.
+
+    >>> buf = b'1\\n2\\n\\n3\\n\\n4\\n5\\n6\\n\\n7'
+    >>> [buf[s:e] for s, e in split_records(buf, 3, BLANK_LINE)]
+    [b'1\\n2\\n\\n3\\n\\n', b'4\\n5\\n6\\n\\n', b'7']
+    >>> split_records(b'', 4)
+    []
+    """
+    size = len(buf)
+    chunks = []
+    start = 0
+    for i in range(1, num_chunks):
+        cut = buf.find(separator, max(start, size * i // num_chunks))
+        if cut < 0:
+            break
+        cut += len(separator)
+        chunks.append((start, cut))
+        start = cut
+    if start < size:
+        chunks.append((start, size))
+    return chunks
+
+
+def count_lines(buf, start, end):
+    """Count the newlines between the offsets, a block at a time
+
+    >>> count_lines(b'a\\nb\\nc', 0, 5)
+    2
+    """
+    count = 0
+    for block_start in range(start, end, BLOCK_SIZE):
+        block_end = min(end, block_start + BLOCK_SIZE)
+        count += buf[block_start:block_end].count(NEWLINE)
+    return count
+
+
+def split_line_groups(buf, num_chunks, lines_per_group):
+    """Offsets of about `num_chunks` chunks of whole groups of lines
+
+    Records are groups of `lines_per_group` lines, which are told apart
+    only by counting lines from the beginning, so the lines before each
+    cut are counted (a scan of the whole buffer, in C) and each cut is
+    moved forward to the end of the group it falls in.
+
+    >>> buf = b'a\\nb\\nc\\nd\\ne\\nf\\ng'
+    >>> [buf[s:e] for s, e in split_line_groups(buf, 3, 2)]
+    [b'a\\nb\\nc\\nd\\n', b'e\\nf\\n', b'g']
+    """
+    size = len(buf)
+    chunks = []
+    start = 0
+    num_lines = 0  # Lines before `start`.
+    for _, cut in split_records(buf, num_chunks)[:-1]:
+        if cut <= start:
+            continue
+        num_lines += count_lines(buf, start, cut)
+        for _ in range(-num_lines % lines_per_group):
+            newline = buf.find(NEWLINE, cut)
+            cut = size if newline < 0 else newline + 1
+            num_lines += 1
+        if cut >= size:
+            break
+        chunks.append((start, cut))
+        start = cut
+    if start < size:
+        chunks.append((start, size))
+    return chunks
+
+
+def map_reduce(source_file, map_chunk, merge, jobs=1, separator=NEWLINE,
+               lines_per_record=1):
+    """Fold the records of a file in `jobs` processes and merge the results
+
+    The file is split at record boundaries into a chunk per job, and
+    `map_chunk(source_file, start, end)` folds the records between both
+    offsets in a process of its own. Every process memory-maps the file
+    (e.g. with `aoc.lines.iter_lines`), so all of them share the pages of
+    the file instead of copying it. The partial results are then merged
+    in the order of the chunks with `merge(a, b)`, which must be
+    associative. `jobs` set to 0 means one per CPU.
+
+    Records are lines, or groups of lines ended by `separator`, or
+    groups of `lines_per_record` lines if more than one.
+
+    With a single job, or a file too small to split, everything is done
+    in this process without splitting anything.
+    """
+    jobs = jobs or os.cpu_count()
+    chunks = []
+    if jobs > 1:
+        with mapped(source_file) as buf:
+            if lines_per_record > 1:
+                chunks = split_line_groups(buf, jobs, lines_per_record)
+            else:
+                chunks = split_records(buf, jobs, separator)
+    if len(chunks) <= 1:
+        return map_chunk(source_file, 0, None)
+
+    # Imported here, as most solvers never get to use it.
+    from concurrent.futures import ProcessPoolExecutor
+    starts, ends = zip(*chunks)
+    with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+        partials = pool.map(
+            map_chunk, itertools.repeat(source_file), starts, ends)
+        return functools.reduce(merge, partials)
@@ -0,0 +1,143 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import collections
+import contextlib
+import os
+import sys
+import threading
+
+
+PROFILERS = ('cprofile', 'tracemalloc', 'sample')
+
+# Profilers to use when none is given explicitly, e.g. `sample,tracemalloc`.
+ENV_PROFILE = 'AOC_PROFILE'
+
+# Default number of entries in the reports of the top functions/allocations.
+DEFAULT_TOP = 25
+
+
+def profilers_from_env():
+    """The profilers asked for through the environment, if any"""
+    kinds = [k.strip() for k in os.environ.get(ENV_PROFILE, '').split(',')]
+    kinds = [k for k in kinds if k]
+    for kind in kinds:
+        if kind not in PROFILERS:
+            raise ValueError('Unknown profiler %r in $%s, use one of: %s' %
+                             (kind, ENV_PROFILE, ', '.join(PROFILERS)))
+    return kinds
+
+
+class StackSampler:
+    """Sampling profiler writing stacks in the folded format
+
+    A background thread looks every `interval` seconds at the stack of
+    the thread that started the sampler, and counts how many times it
+    has seen each stack. Sampling does not slow down the code profiled
+    the way cProfile does, and the folded stacks (one `a;b;c count` line
+    per stack) are the input of flamegraph.pl, speedscope and the like.
+    """
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._thread_id = None
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+
+    def __enter__(self):
+        self._thread_id = threading.get_ident()
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._sampler.join()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append('%s (%s:%d)' % (
+                    code.co_name,
+                    os.path.basename(code.co_filename),
+                    code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def write_folded(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write('%s %d\n' % (stack, count))
+
+
+@contextlib.contextmanager
+def _cprofile(prefix, top):
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(prefix + '.pstats')
+        with open(prefix + '.cprofile.txt', 'w') as f:
+            stats = pstats.Stats(profiler, stream=f)
+            stats.sort_stats('cumulative').print_stats(top)
+
+
+@contextlib.contextmanager
+def _tracemalloc(prefix, top):
+    import tracemalloc
+    tracemalloc.start()
+    try:
+        yield
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),  # E.g. the sampled stacks.
+            tracemalloc.Filter(False, '<frozen importlib.*>'),
+        ])
+        with open(prefix + '.alloc.txt', 'w') as f:
+            f.write('Peak traced memory: %.1f KiB\n' % (peak / 1024))
+            f.write('Top %d allocation sites still alive at the end:\n' % top)
+            for stat in snapshot.statistics('lineno')[:top]:
+                f.write('%s\n' % stat)
+
+
+@contextlib.contextmanager
+def _sample(prefix, top):
+    with StackSampler() as sampler:
+        yield
+    sampler.write_folded(prefix + '.folded')
+
+
+@contextlib.contextmanager
+def profiled(kinds, prefix, top=DEFAULT_TOP):
+    """Run the block under the given profilers, writing their reports
+
+    Every report is written to a file named `prefix` plus an extension:
+    `.folded` for the sampled stacks, `.alloc.txt` for the allocations
+    and `.pstats` and `.cprofile.txt` for cProfile. Profilers are nested
+    in the order given, so the outer ones also see the inner ones.
+    """
+    if not kinds:
+        yield
+        return
+
+    os.makedirs(os.path.dirname(prefix) or '.', exist_ok=True)
+    wrappers = {
+        'cprofile': _cprofile,
+        'tracemalloc': _tracemalloc,
+        'sample': _sample,
+    }
+    with contextlib.ExitStack() as stack:
+        for kind in kinds:
+            stack.enter_context(wrappers[kind](prefix, top))
+        yield
@@ -0,0 +1,662 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import argparse
+import glob
+import importlib
+import json
+import math
+import os
+import re
+import sys
+import time
+
+from aoc import profiling
+from aoc.lazy import lazy_import
+
+# Starting up fast matters as much as solving fast for the small inputs,
+# so what is not needed by every command is imported when first used.
+inspect = lazy_import('inspect')
+statistics = lazy_import('statistics')
+
+try:
+    import resource
+except ImportError:  # Not available on Windows.
+    resource = None
+
+
+# The root of the repository, where all the `day_NN` directories live.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Where the answers are cached, see `aoc.cache`.
+CACHE_DIR = os.path.join(ROOT, '.cache')
+
+# Where the reports of the profilers are written by default.
+PROFILE_DIR = os.path.join(ROOT, 'profiles')
+
+# Where the last known wall time of each job is kept, to schedule them.
+TIMINGS_FILE = os.path.join(ROOT, '.timings.json')
+
+REGEX_DAY_DIR = re.compile(r'day_(?P<day>\d+)$')
+REGEX_PART_FILE = re.compile(r'part_(?P<first>\d)(_(?P<second>\d))?\.py$')
+
+
+def import_day_module(day, name):
+    """Import a module of a day, e.g. `part_1` or `generator`
+
+    The modules of a day import their sibling modules (e.g. `import
+    filesystem`) as if they were run from their own directory, so that
+    directory has to be in the path too.
+    """
+    day_dir = os.path.join(ROOT, 'day_%02d' % day)
+    for path in (ROOT, day_dir):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    return importlib.import_module('day_%02d.%s' % (day, name))
+
+
+class Solver:
+    """One part of one day, as found on disk
+
+    Modules named `part_N.py` solve a single part through a `solve()`
+    function, while modules named `part_1_2.py` solve both parts through
+    `solve_part_1()` and `solve_part_2()`. All of them receive the path
+    to the input file as the first argument.
+    """
+
+    def __init__(self, day, part, module_path, func_name):
+        self.day = day
+        self.part = part
+        self.module_path = module_path
+        self.func_name = func_name
+
+    @property
+    def day_dir(self):
+        return os.path.dirname(self.module_path)
+
+    @property
+    def module_name(self):
+        return '%s.%s' % (
+            os.path.basename(self.day_dir),
+            os.path.splitext(os.path.basename(self.module_path))[0])
+
+    def default_input(self):
+        """The input the day uses when run as a script"""
+        for name in ('part_%d.txt' % self.part, 'part_1_2.txt', 'part_1.txt'):
+            path = os.path.join(self.day_dir, 'inputs', name)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def load(self):
+        """Import the module of the solver and return the solving function"""
+        module = import_day_module(
+            self.day, self.module_name.rpartition('.')[2])
+        return getattr(module, self.func_name)
+
+    def __str__(self):
+        return 'day %02d part %d' % (self.day, self.part)
+
+
+def find_solvers(root=ROOT):
+    """Find all the solvers in the repository, sorted by day and part
+
+    Only the file names are inspected, so nothing gets imported here.
+    """
+    solvers = []
+    for day_dir in glob.glob(os.path.join(root, 'day_*')):
+        m_day = REGEX_DAY_DIR.search(day_dir)
+        if not m_day or not os.path.isdir(day_dir):
+            continue
+        day = int(m_day['day'])
+        for module_path in glob.glob(os.path.join(day_dir, 'part_*.py')):
+            m_part = REGEX_PART_FILE.search(module_path)
+            if not m_part:  # E.g. `part_1_inefficient.py`
+                continue
+            if m_part['second']:
+                for part in (m_part['first'], m_part['second']):
+                    solvers.append(Solver(
+                        day, int(part), module_path, 'solve_part_%s' % part))
+            else:
+                solvers.append(Solver(
+                    day, int(m_part['first']), module_path, 'solve'))
+    solvers.sort(key=lambda s: (s.day, s.part))
+    return solvers
+
+
+def select_solvers(solvers, days=None, parts=None):
+    """Keep only the solvers for the given days and parts, if any"""
+    return [
+        s for s in solvers
+        if (not days or s.day in days) and (not parts or s.part in parts)
+    ]
+
+
+def parse_days(values):
+    """Parse days given as numbers or as ranges of numbers
+
+    >>> sorted(parse_days(['1', '5-7', '13']))
+    [1, 5, 6, 7, 13]
+    """
+    days = set()
+    for value in values:
+        if '-' in value:
+            first, last = map(int, value.split('-'))
+            days.update(range(first, last + 1))
+        else:
+            days.add(int(value))
+    return days
+
+
+def parse_params(values):
+    """Parse `key=value` solver parameters, with integers if possible
+
+    >>> parse_params(['y=10', 'name=abc'])
+    {'y': 10, 'name': 'abc'}
+    """
+    params = {}
+    for value in values:
+        key, _, raw = value.partition('=')
+        try:
+            params[key] = int(raw)
+        except ValueError:
+            params[key] = raw
+    return params
+
+
+def percentile(values, pct):
+    """Percentile using the nearest-rank method
+
+    >>> percentile([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], 95)
+    10
+    >>> percentile([3, 1, 2], 50)
+    2
+    """
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def get_input_size(input_file):
+    """Return the number of lines and bytes of the input file"""
+    num_lines = 0
+    num_bytes = 0
+    with open(input_file, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            num_lines += block.count(b'\n')
+            num_bytes += len(block)
+    # A last line without a trailing newline is still a line.
+    if num_bytes and not block.endswith(b'\n'):
+        num_lines += 1
+    return num_lines, num_bytes
+
+
+def get_peak_rss():
+    """Peak resident set size of the process, in bytes, if known"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def reset_peak_rss():
+    """Make the peak RSS start again from the current RSS, if possible
+
+    Only Linux can, through `/proc/self/clear_refs`, so that a process
+    running several jobs reports the peak of each one. Returns whether
+    it could, as otherwise the peak is that of the whole process.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        return False
+    return True
+
+
+class Measurement:
+    """The answer and timings of several runs of a solver"""
+
+    def __init__(self, solver, input_file, answer, wall_times, cpu_times,
+                 peak_rss, num_lines, num_bytes, cached=False):
+        self.solver = solver
+        self.input_file = input_file
+        self.answer = answer
+        self.wall_times = wall_times
+        self.cpu_times = cpu_times
+        self.peak_rss = peak_rss
+        self.num_lines = num_lines
+        self.num_bytes = num_bytes
+        self.cached = cached
+
+    @property
+    def wall_median(self):
+        return statistics.median(self.wall_times)
+
+    @property
+    def wall_p95(self):
+        return percentile(self.wall_times, 95)
+
+    @property
+    def cpu_median(self):
+        return statistics.median(self.cpu_times)
+
+    @property
+    def lines_per_second(self):
+        return self.num_lines / self.wall_median if self.wall_median else 0
+
+    @property
+    def bytes_per_second(self):
+        return self.num_bytes / self.wall_median if self.wall_median else 0
+
+    def to_dict(self):
+        return {
+            'day': self.solver.day,
+            'part': self.solver.part,
+            'input': self.input_file,
+            'answer': self.answer,
+            'cached': self.cached,
+            'wall_times': self.wall_times,
+            'cpu_times': self.cpu_times,
+            'wall_median': self.wall_median,
+            'wall_p95': self.wall_p95,
+            'cpu_median': self.cpu_median,
+            'peak_rss': self.peak_rss,
+            'lines': self.num_lines,
+            'bytes': self.num_bytes,
+            'lines_per_second': self.lines_per_second,
+            'bytes_per_second': self.bytes_per_second,
+        }
+
+
+def measure(solver, input_file=None, params=None, repeat=1, warmup=0,
+            cache=None, profilers=(), profile_dir=PROFILE_DIR,
+            profile_top=profiling.DEFAULT_TOP):
+    """Run a solver `warmup` + `repeat` times, timing the last `repeat`
+
+    Wall time and CPU time are measured around the call to the solver
+    only, so importing its module and computing the size of the input
+    are not accounted. The peak RSS is reset first where the platform
+    allows (see `reset_peak_rss`), and is otherwise the high-water mark
+    of the whole process, previous jobs included.
+
+    If a `cache` is given and has the answer, the solver is not even
+    imported and the timings are those of looking the answer up.
+
+    The timed runs can be wrapped in any of `profiling.PROFILERS`, which
+    write their reports to `profile_dir`. The solver knows nothing about
+    it, but mind that the timings include the overhead of profiling.
+    """
+    input_file = input_file or solver.default_input()
+    reset_peak_rss()
+
+    if cache is not None:
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        hit, answer = cache.get(solver, input_file, params or {})
+        cpu_time = time.process_time() - cpu_start
+        wall_time = time.perf_counter() - wall_start
+        if hit:
+            # Remembered by the cache, so the input is not read at all.
+            num_lines, num_bytes = cache.input_size(input_file)
+            return Measurement(
+                solver=solver,
+                input_file=input_file,
+                answer=answer,
+                wall_times=[wall_time],
+                cpu_times=[cpu_time],
+                peak_rss=get_peak_rss(),
+                num_lines=num_lines,
+                num_bytes=num_bytes,
+                cached=True,
+            )
+
+    func = solver.load()
+    given_params = params or {}
+
+    # Parameters are given for all the solvers run at once, so pass
+    # each solver only those it knows about.
+    accepted = inspect.signature(func).parameters
+    params = {k: v for k, v in given_params.items() if k in accepted}
+
+    for _ in range(warmup):
+        func(input_file, **params)
+
+    answer = None
+    wall_times = []
+    cpu_times = []
+    profile_prefix = os.path.join(profile_dir, 'day_%02d_part_%d-%s' % (
+        solver.day, solver.part, time.strftime('%Y%m%d-%H%M%S')))
+    with profiling.profiled(profilers, profile_prefix, top=profile_top):
+        for _ in range(repeat):
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            answer = func(input_file, **params)
+            cpu_times.append(time.process_time() - cpu_start)
+            wall_times.append(time.perf_counter() - wall_start)
+
+    if cache is not None:
+        cache.put(solver, input_file, given_params, answer)
+
+    num_lines, num_bytes = get_input_size(input_file)
+    return Measurement(
+        solver=solver,
+        input_file=input_file,
+        answer=answer,
+        wall_times=wall_times,
+        cpu_times=cpu_times,
+        peak_rss=get_peak_rss(),
+        num_lines=num_lines,
+        num_bytes=num_bytes,
+    )
+
+
+def format_measurement(m):
+    """Format a measurement as a line of the report"""
+    answer = str(m.answer)
+    if m.cached:
+        answer += ' (cached)'
+    if os.linesep in answer:
+        # Answers drawn on several lines go below the timings.
+        answer = os.linesep + answer
+    peak_rss = (
+        '%8.1f MB' % (m.peak_rss / 2**20) if m.peak_rss is not None
+        else '%11s' % 'n/a')
+    return (
+        '%s | wall %9.4f s (p95 %9.4f s) | cpu %9.4f s | '
+        'rss %s | %12.0f lines/s | %8.2f MB/s | %s' % (
+            m.solver,
+            m.wall_median,
+            m.wall_p95,
+            m.cpu_median,
+            peak_rss,
+            m.lines_per_second,
+            m.bytes_per_second / 2**20,
+            answer,
+        ))
+
+
+def load_generator(day):
+    """Return the function generating synthetic inputs for the day"""
+    return import_day_module(day, 'generator').generate
+
+
+def generate_input(day, size, output_file, seed=0, **kwargs):
+    """Write a synthetic input for the day of the given size"""
+    generate = load_generator(day)
+    with open(output_file, 'w') as out:
+        generate(out, size, seed=seed, **kwargs)
+
+
+def job_key(solver, input_file):
+    """Key identifying a job among the known timings"""
+    return '%s|%s' % (solver, os.path.relpath(input_file, ROOT))
+
+
+def load_timings():
+    try:
+        with open(TIMINGS_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_timings(timings, measurements):
+    """Remember the median wall time of the jobs just measured"""
+    for m in measurements:
+        if m.cached:  # That is not how long the job takes.
+            continue
+        timings[job_key(m.solver, m.input_file)] = m.wall_median
+    try:
+        with open(TIMINGS_FILE, 'w') as f:
+            json.dump(timings, f, indent=2, sort_keys=True)
+    except OSError:
+        pass  # Not being able to remember is not a reason to fail.
+
+
+def schedule(jobs, timings):
+    """Sort the jobs so that the longest known ones go first
+
+    The whole run cannot take less than its slowest job, so starting the
+    slow ones first lets the quick ones fill the gaps in the other
+    workers, instead of a slow one starting at the very end. Jobs never
+    run before go first of all, as they may be slow too, and the larger
+    the input the sooner they start.
+    """
+    def priority(job):
+        solver, input_file = job
+        known = timings.get(job_key(solver, input_file))
+        if known is None:
+            return 0, -os.path.getsize(input_file)
+        return 1, -known
+    return sorted(jobs, key=priority)
+
+
+def run_serial(jobs, **kwargs):
+    """Measure the jobs one after another in this process"""
+    for solver, input_file in jobs:
+        yield measure(solver, input_file=input_file, **kwargs)
+
+
+def run_parallel(jobs, num_workers, **kwargs):
+    """Measure the jobs in a pool of processes, yielding as they finish
+
+    The processes are kept for all the jobs, so that each job does not
+    pay for starting an interpreter and importing everything again. The
+    peak RSS of each job is its own where the platform can reset it (see
+    `reset_peak_rss`), and otherwise the highest one of its process so
+    far, previous jobs included.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    with ProcessPoolExecutor(max_workers=num_workers) as pool:
+        futures = [
+            pool.submit(measure, solver, input_file=input_file, **kwargs)
+            for solver, input_file in jobs
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m aoc',
+        description='Run and benchmark the Advent of Code 2022 solvers.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser(
+        'list', help='List all the solvers found.').set_defaults(
+            func=cmd_list)
+
+    run = commands.add_parser('run', help='Run the solvers.')
+    run.set_defaults(func=cmd_run)
+    run.add_argument(
+        'days', nargs='*',
+        help='Days to run, e.g. `1 5-7 13`. All of them by default.')
+    run.add_argument(
+        '-p', '--part', type=int, action='append', choices=(1, 2),
+        help='Part to run. Both of them by default.')
+    run.add_argument(
+        '-i', '--input',
+        help='Input file. Each day uses its own input by default.')
+    run.add_argument(
+        '--param', action='append', default=[], metavar='KEY=VALUE',
+        help='Extra parameter for the solvers, e.g. `y=10` for day 15.')
+    run.add_argument(
+        '-r', '--repeat', type=int, default=1,
+        help='Number of timed runs per part.')
+    run.add_argument(
+        '-w', '--warmup', type=int, default=0,
+        help='Number of untimed runs per part before the timed ones.')
+    run.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='Number of processes to run the parts in parallel, '
+             'longest known first. 0 means one per CPU. The processes '
+             'run several parts each, so the peak RSS of a part is its '
+             'own only where it can be reset (Linux), and otherwise '
+             'includes the parts run before it in the same process.')
+    run.add_argument(
+        '--no-cache', action='store_true',
+        help='Always run the solvers, neither reading nor storing answers '
+             'in the cache. Use it when benchmarking.')
+    run.add_argument(
+        '--cache-size', type=float, default=16, metavar='MB',
+        help='Maximum size of the cache of answers.')
+    run.add_argument(
+        '--profile', action='append', choices=profiling.PROFILERS,
+        help='Profile the timed runs of each part (can be repeated). '
+             'Defaults to the comma-separated profilers in $%s.' %
+             profiling.ENV_PROFILE)
+    run.add_argument(
+        '--profile-dir', default=PROFILE_DIR,
+        help='Where to write the reports of the profilers.')
+    run.add_argument(
+        '--profile-top', type=int, default=profiling.DEFAULT_TOP,
+        help='Number of entries in the reports of top functions and '
+             'allocations.')
+    run.add_argument(
+        '--json', metavar='PATH',
+        help='Also write the measurements as JSON to this file.')
+
+    generate = commands.add_parser(
+        'generate', help='Generate a synthetic input for a day.')
+    generate.set_defaults(func=cmd_generate)
+    generate.add_argument('day', type=int)
+    generate.add_argument(
+        'size', type=int,
+        help='Size of the input, in the unit of the day: elves, rounds, '
+             'rucksacks, moves, characters, directories, trees per side...')
+    generate.add_argument('-o', '--output', required=True)
+    generate.add_argument('-s', '--seed', type=int, default=0)
+
+    scale = commands.add_parser(
+        'scale', help='Measure a day on generated inputs of several sizes.')
+    scale.set_defaults(func=cmd_scale)
+    scale.add_argument('day', type=int)
+    scale.add_argument('sizes', type=int, nargs='+')
+    scale.add_argument(
+        '-p', '--part', type=int, action='append', choices=(1, 2),
+        help='Part to run. Both of them by default.')
+    scale.add_argument(
+        '--param', action='append', default=[], metavar='KEY=VALUE',
+        help='Extra parameter for the solvers.')
+    scale.add_argument(
+        '-r', '--repeat', type=int, default=1,
+        help='Number of timed runs per size and part.')
+    scale.add_argument('-s', '--seed', type=int, default=0)
+    scale.add_argument(
+        '--csv', metavar='PATH',
+        help='Write the results to this file instead of the standard output.')
+
+    # These import this module, so they are imported here.
+    from aoc import bench, streams, worker
+    bench.add_parser(commands)
+    streams.add_parser(commands)
+    worker.add_parser(commands)
+    return parser
+
+
+def cmd_list(args):
+    for solver in find_solvers():
+        print('%s: %s' % (solver, os.path.relpath(solver.module_path)))
+
+
+def cmd_run(args):
+    from aoc.cache import AnswerCache
+
+    solvers = select_solvers(
+        find_solvers(), parse_days(args.days), args.part)
+    if not solvers:
+        sys.exit('No solvers found for the given days and parts.')
+
+    profilers = args.profile
+    if not profilers:
+        try:
+            profilers = profiling.profilers_from_env()
+        except ValueError as e:
+            sys.exit(str(e))
+
+    jobs = [(s, args.input or s.default_input()) for s in solvers]
+    kwargs = {
+        'params': parse_params(args.param),
+        'repeat': args.repeat,
+        'warmup': args.warmup,
+        'cache': None if args.no_cache else AnswerCache(
+            CACHE_DIR, max_bytes=int(args.cache_size * 2**20)),
+        'profilers': profilers,
+        'profile_dir': args.profile_dir,
+        'profile_top': args.profile_top,
+    }
+    if kwargs['profilers']:
+        # A cached answer would leave nothing to profile.
+        kwargs['cache'] = None
+    timings = load_timings()
+
+    start = time.perf_counter()
+    if args.jobs == 1:
+        results = run_serial(jobs, **kwargs)
+    else:
+        results = run_parallel(
+            schedule(jobs, timings),
+            num_workers=args.jobs or os.cpu_count(),
+            **kwargs)
+    measurements = []
+    for m in results:
+        print(format_measurement(m))
+        measurements.append(m)
+    print('Total wall time: %.4f s' % (time.perf_counter() - start))
+
+    save_timings(timings, measurements)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump([m.to_dict() for m in measurements], f, indent=2)
+
+
+def cmd_generate(args):
+    generate_input(args.day, args.size, args.output, seed=args.seed)
+
+
+def cmd_scale(args):
+    """Measure the solvers of a day on generated inputs of growing size
+
+    The measurements of each size run in a process of their own, apart
+    from the generation of the input, and the peak RSS is reset before
+    each one where the platform allows (see `reset_peak_rss`). The
+    results are written as CSV, to be plotted against the size of the
+    input.
+    """
+    import csv
+    import tempfile
+
+    solvers = select_solvers(find_solvers(), {args.day}, args.part)
+    if not solvers:
+        sys.exit('No solvers found for the given day and parts.')
+
+    out = open(args.csv, 'w', newline='') if args.csv else sys.stdout
+    writer = csv.writer(out)
+    writer.writerow([
+        'day', 'part', 'size', 'lines', 'bytes',
+        'wall_median', 'wall_p95', 'cpu_median', 'peak_rss'])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes:
+            input_file = os.path.join(
+                tmp_dir, 'day_%02d_%d.txt' % (args.day, size))
+            generate_input(args.day, size, input_file, seed=args.seed)
+            results = run_parallel(
+                [(s, input_file) for s in solvers],
+                num_workers=1,
+                params=parse_params(args.param),
+                repeat=args.repeat)
+            for m in results:
+                writer.writerow([
+                    m.solver.day, m.solver.part, size,
+                    m.num_lines, m.num_bytes,
+                    '%.6f' % m.wall_median, '%.6f' % m.wall_p95,
+                    '%.6f' % m.cpu_median, m.peak_rss])
+                out.flush()
+    if out is not sys.stdout:
+        out.close()
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
@@ -0,0 +1,332 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import os
+import stat
+import sys
+import time
+
+from aoc.lazy import lazy_import
+from aoc.lines import NEWLINE
+from aoc.runner import import_day_module
+
+# The runner imports this module to know its command line, which must not
+# make all the other commands start slower.
+asyncio = lazy_import('asyncio')
+socket = lazy_import('socket')
+
+
+# Bytes asked for at once to the stream.
+CHUNK_SIZE = 1 << 16
+
+# Batches of lines read but not yet consumed by the solver. When they are
+# this many the stream is not read anymore until the solver catches up,
+# so the producer is blocked by the pipe or socket instead of filling up
+# our memory.
+MAX_PENDING_BATCHES = 16
+
+
+def _decoded(lines):
+    for line in lines:
+        yield line.decode('ascii')
+
+
+def _parsed_by(parser_name):
+    """The lines as the parser of the module gives them to the solver"""
+    def parse(module, lines):
+        return getattr(module, parser_name)(lines)
+    return parse
+
+
+def _as_bytes(module, lines):
+    return lines
+
+
+def _as_str(module, lines):
+    return _decoded(lines)
+
+
+def _solve_day_10_part_1(module, lines):
+    return module.compute_signal_strength(
+        _decoded(lines), at_cycles=module.AT_CYCLES)
+
+
+def _solve_day_10_part_2(module, lines):
+    return module.crt_to_str(module.compute_crt(_decoded(lines)))
+
+
+def _solver(func_name, parse):
+    def solve(module, lines):
+        return getattr(module, func_name)(parse(module, lines))
+    return solve
+
+
+# The solvers that consume the lines one at a time, by (day, part), with
+# the module to import and how to solve from an iterable of bytes lines.
+STREAMS = {
+    (1, 1): ('part_1', _solver('get_max_calories', _as_bytes)),
+    (1, 2): ('part_2', _solver('get_top_three_max_calories', _as_bytes)),
+    (2, 1): ('part_1', _solver(
+        'get_total_score', _parsed_by('parse_plays_data'))),
+    (2, 2): ('part_2', _solver(
+        'get_total_score', _parsed_by('parse_plays_data'))),
+    (3, 1): ('part_1', _solver(
+        'get_sum_of_priorities', _parsed_by('parse_rucksacks_data'))),
+    (3, 2): ('part_2', _solver(
+        'get_sum_of_badges', _parsed_by('parse_rucksacks_data'))),
+    (4, 1): ('part_1', _solver(
+        'get_num_of_fully_overlaps', _parsed_by('parse_ranges_data'))),
+    (4, 2): ('part_2', _solver(
+        'get_num_of_overlaps', _parsed_by('parse_ranges_data'))),
+    (6, 1): ('part_1', _solver('get_num_chars_to_process', _as_str)),
+    (6, 2): ('part_2', _solver('get_num_chars_to_process', _as_str)),
+    (10, 1): ('part_1', _solve_day_10_part_1),
+    (10, 2): ('part_2', _solve_day_10_part_2),
+}
+
+
+class StreamStats:
+    """What has been read so far from a stream"""
+
+    def __init__(self):
+        self.lines = 0
+        self.bytes = 0
+        self.start = time.perf_counter()
+
+    def __str__(self):
+        elapsed = time.perf_counter() - self.start
+        return '%d lines, %.1f MB in %.1f s (%.1f MB/s)' % (
+            self.lines, self.bytes / 1e6, elapsed,
+            self.bytes / 1e6 / elapsed if elapsed else 0)
+
+
+class _FileReader:
+    """Reads a regular file with the interface of `asyncio.StreamReader`
+
+    The event loop can only watch pipes, sockets and terminals, so when
+    the standard input is redirected from a file this reads it in the
+    default executor instead.
+    """
+
+    def __init__(self, f):
+        self._f = f
+
+    async def read(self, n):
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._f.read, n)
+
+
+async def _read_batches(reader, queue, stats):
+    """Put the lines of the stream on the queue, a chunk at a time
+
+    Each chunk becomes a batch with the whole lines in it, and the piece
+    of line at its end is kept for the next one. `None` marks the end,
+    and an error reading is put on the queue for the solver to raise it.
+    """
+    rest = b''
+    try:
+        while True:
+            chunk = await reader.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            stats.bytes += len(chunk)
+            lines = (rest + chunk).split(NEWLINE)
+            rest = lines.pop()
+            if lines:
+                stats.lines += len(lines)
+                # Waits while the queue is full, which is the back-pressure.
+                await queue.put(lines)
+    except (OSError, ValueError) as e:
+        await queue.put(e)
+        return
+    if rest:
+        stats.lines += 1
+        await queue.put([rest])
+    await queue.put(None)
+
+
+def _iter_queue(queue, loop):
+    """Yield the lines on the queue, from a thread other than the loop's"""
+    while True:
+        batch = asyncio.run_coroutine_threadsafe(queue.get(), loop).result()
+        if batch is None:
+            return
+        if isinstance(batch, Exception):
+            raise batch
+        yield from batch
+
+
+async def _report(label, stats, interval):
+    while True:
+        await asyncio.sleep(interval)
+        print('%s: %s' % (label, stats), file=sys.stderr, flush=True)
+
+
+async def solve_stream(day, part, reader, progress=None, label=None):
+    """Solve a part of a day with the lines read from `reader`
+
+    `reader` is anything with a coroutine `read(n)` returning b'' at the
+    end, like `asyncio.StreamReader`. The solver runs in another thread,
+    pulling the lines as it needs them, while the loop keeps reading up
+    to `MAX_PENDING_BATCHES` ahead of it. Every `progress` seconds, if
+    given, the lines and bytes read so far are reported to stderr.
+    """
+    module_name, solve = STREAMS[(day, part)]
+    module = import_day_module(day, module_name)
+    label = label or 'day %02d part %d' % (day, part)
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=MAX_PENDING_BATCHES)
+    stats = StreamStats()
+    reading = asyncio.create_task(_read_batches(reader, queue, stats))
+    reporting = None
+    if progress:
+        reporting = asyncio.create_task(_report(label, stats, progress))
+    try:
+        answer = await asyncio.to_thread(
+            solve, module, _iter_queue(queue, loop))
+    finally:
+        # Nothing more is read once the solver is done, or has failed.
+        reading.cancel()
+        if reporting is not None:
+            reporting.cancel()
+    if progress:
+        print('%s: %s' % (label, stats), file=sys.stderr, flush=True)
+    return answer
+
+
+async def open_stdin():
+    loop = asyncio.get_running_loop()
+    stdin = sys.stdin.buffer
+    if stat.S_ISREG(os.fstat(stdin.fileno()).st_mode):
+        return _FileReader(stdin)
+    reader = asyncio.StreamReader(limit=CHUNK_SIZE)
+    await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), stdin)
+    return reader
+
+
+def parse_source(source):
+    """Split a source into its kind and address
+
+    >>> parse_source('-')
+    ('stdin', None)
+    >>> parse_source('unix:/tmp/aoc.sock')
+    ('unix', '/tmp/aoc.sock')
+    >>> parse_source('tcp:9000')
+    ('tcp', ('127.0.0.1', 9000))
+    >>> parse_source('tcp:0.0.0.0:9000')
+    ('tcp', ('0.0.0.0', 9000))
+    """
+    if source in ('-', 'stdin'):
+        return 'stdin', None
+    kind, _, address = source.partition(':')
+    if kind == 'unix' and address:
+        return kind, address
+    if kind == 'tcp' and address:
+        host, _, port = address.rpartition(':')
+        return kind, (host or '127.0.0.1', int(port))
+    raise ValueError(
+        'Unknown source %r, use `-`, `unix:PATH` or `tcp:[HOST:]PORT`' %
+        source)
+
+
+def _remove_stale_socket(path):
+    """Remove the socket left by a previous server that did not clean up"""
+    try:
+        if stat.S_ISSOCK(os.stat(path).st_mode):
+            os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def serve(day, part, kind, address, once=False, progress=None):
+    """Solve each connection to a Unix or TCP socket as a separate input
+
+    The answer is written back to the connection, once its writing end
+    is closed, and to the standard output. With `once`, the server stops
+    after the first connection.
+    """
+    done = asyncio.Event()
+    count = 0
+
+    async def handle(reader, writer):
+        nonlocal count
+        count += 1
+        label = 'day %02d part %d #%d' % (day, part, count)
+        try:
+            answer = await solve_stream(
+                day, part, reader, progress=progress, label=label)
+            writer.write(('%s\n' % (answer,)).encode())
+            await writer.drain()
+            print('%s: %s' % (label, answer), flush=True)
+        finally:
+            writer.close()
+            if once:
+                done.set()
+
+    if kind == 'unix':
+        _remove_stale_socket(address)
+        server = await asyncio.start_unix_server(
+            handle, address, limit=CHUNK_SIZE)
+    else:
+        server = await asyncio.start_server(
+            handle, *address, limit=CHUNK_SIZE,
+            family=socket.AF_INET, reuse_address=True)
+    print('Listening on %s:%s' % (kind, address if kind == 'unix' else
+                                  '%s:%d' % address),
+          file=sys.stderr, flush=True)
+    try:
+        async with server:
+            if once:
+                await done.wait()
+            else:
+                await server.serve_forever()
+    finally:
+        if kind == 'unix':
+            _remove_stale_socket(address)
+
+
+async def _solve_stdin(day, part, progress):
+    return await solve_stream(day, part, await open_stdin(), progress)
+
+
+def cmd_stream(args):
+    if (args.day, args.part) not in STREAMS:
+        sys.exit('Day %02d part %d cannot be streamed, only these can: %s' % (
+            args.day, args.part,
+            ', '.join('%d/%d' % key for key in sorted(STREAMS))))
+    try:
+        kind, address = parse_source(args.source)
+    except ValueError as e:
+        sys.exit(str(e))
+
+    try:
+        if kind == 'stdin':
+            print(asyncio.run(
+                _solve_stdin(args.day, args.part, args.progress)))
+        else:
+            asyncio.run(serve(args.day, args.part, kind, address,
+                              once=args.once, progress=args.progress))
+    except KeyboardInterrupt:
+        pass
+
+
+def add_parser(commands):
+    stream = commands.add_parser(
+        'stream',
+        help='Solve a part with the input read from stdin or a socket.')
+    stream.set_defaults(func=cmd_stream)
+    stream.add_argument('day', type=int)
+    stream.add_argument(
+        '-p', '--part', type=int, default=1, choices=(1, 2))
+    stream.add_argument(
+        '-s', '--source', default='-',
+        help='Where to read the input from: `-` for stdin (the default), '
+             '`unix:PATH` or `tcp:[HOST:]PORT` to listen there and solve '
+             'each connection.')
+    stream.add_argument(
+        '--once', action='store_true',
+        help='Stop listening after the first connection.')
+    stream.add_argument(
+        '--progress', type=float, metavar='SECONDS',
+        help='Report the lines and bytes read every this many seconds.')
@@ -0,0 +1,107 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import contextlib
+import json
+import sys
+
+from aoc.runner import CACHE_DIR, ROOT, find_solvers, measure, select_solvers
+
+
+def run_job(job, solvers, cache=None):
+    """Run a job given as a dict, returning its measurement as a dict
+
+    A job has a `day` and a `part`, and optionally an `input` file (the
+    one of the day by default), `params` for the solver, and a number of
+    `repeat` and `warmup` runs, as for `python -m aoc run`. Errors are
+    returned as `{"error": message}`, as the worker has to carry on.
+    """
+    try:
+        selected = select_solvers(solvers, {job['day']}, {job['part']})
+        if not selected:
+            return {'error': 'No solver for day %s part %s' % (
+                job['day'], job['part'])}
+        # Whatever the solver prints must not be taken as the reply.
+        with contextlib.redirect_stdout(sys.stderr):
+            m = measure(
+                selected[0],
+                input_file=job.get('input'),
+                params=job.get('params'),
+                repeat=job.get('repeat', 1),
+                warmup=job.get('warmup', 0),
+                cache=cache)
+        return m.to_dict()
+    except Exception as e:  # pylint: disable=broad-except
+        return {'error': '%s: %s' % (type(e).__name__, e)}
+
+
+def serve(jobs_in, results_out, cache=None):
+    """Run the jobs read one per line, as JSON, until the end of the input
+
+    Each result is written as a line of JSON as soon as it is ready. The
+    modules of the days stay imported from one job to the next, so only
+    the first job of each day pays for starting up.
+    """
+    solvers = find_solvers()
+    for line in jobs_in:
+        if not line.strip():
+            continue
+        try:
+            job = json.loads(line)
+        except ValueError as e:
+            result = {'error': 'Invalid job: %s' % e}
+        else:
+            result = run_job(job, solvers, cache)
+        results_out.write(json.dumps(result) + '\n')
+        results_out.flush()
+
+
+class Worker:
+    """A warm `python -m aoc worker` process to run jobs in
+
+    >>> with Worker('--no-cache') as worker:
+    ...     worker.run(1, 1)['answer']
+    72718
+    """
+
+    def __init__(self, *args):
+        # Only the clients need it, not every command that imports this.
+        import subprocess
+        self._process = subprocess.Popen(
+            [sys.executable, '-m', 'aoc', 'worker'] + list(args),
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, cwd=ROOT,
+            text=True, bufsize=1)
+
+    def run(self, day, part, **job):
+        job.update(day=day, part=part)
+        self._process.stdin.write(json.dumps(job) + '\n')
+        return json.loads(self._process.stdout.readline())
+
+    def close(self):
+        self._process.stdin.close()
+        self._process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def cmd_worker(args):
+    cache = None
+    if not args.no_cache:
+        from aoc.cache import AnswerCache
+        cache = AnswerCache(CACHE_DIR)
+    serve(sys.stdin, sys.stdout, cache)
+
+
+def add_parser(commands):
+    worker = commands.add_parser(
+        'worker',
+        help='Run the jobs read from stdin, one JSON object per line, '
+             'in a single warm process.')
+    worker.set_defaults(func=cmd_worker)
+    worker.add_argument(
+        '--no-cache', action='store_true',
+        help='Always run the solvers, neither reading nor storing answers '
+             'in the cache.')
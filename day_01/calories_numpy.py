@@ -0,0 +1,103 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import numpy as np
+
+from aoc.lines import iter_blocks, mapped
+
+
+# The value of the blank lines between elves, as no item is negative.
+BLANK = -1
+
+NEWLINE = ord('\n')
+ZERO = ord('0')
+
+
+def parse_calories(block):
+    """Parse the lines of a block of bytes into an array of integers
+
+    The digits of all the lines are added up at once, one position from
+    the right at a time, so there are as many passes as digits in the
+    longest line instead of a Python loop per line. Blank lines are
+    `BLANK`.
+
+    >>> parse_calories(np.frombuffer(b'1000\\n20\\n\\n3', dtype=np.uint8))
+    array([1000,   20,   -1,    3])
+    """
+    newlines = np.flatnonzero(block == NEWLINE)
+    ends = np.append(newlines, len(block))
+    lengths = ends - np.insert(newlines + 1, 0, 0)
+
+    values = np.zeros(len(ends), dtype=np.int64)
+    # Offsets fit in 32 bits for blocks of up to 2 GiB, and are faster.
+    positions = ends.astype(np.int32) - 1
+    lengths = lengths.astype(np.int32)
+    for digit in range(int(lengths.max(initial=0))):
+        # Lines with fewer digits take the byte before them instead, which
+        # is then zeroed, as it is way faster than selecting the lines.
+        digits = block.take(np.maximum(positions, 0))
+        digits -= ZERO
+        digits *= lengths > digit
+        values += digits * np.int64(10 ** digit)
+        positions -= 1
+    values[lengths == 0] = BLANK
+    return values
+
+
+def get_top_calories(source_file, k=3, start=0, end=None):
+    """Get the calories of the top `k` elves, from the most
+
+    This is the same as `elves.TopElves` does for the lines between the
+    offsets `start` and `end`, but a block at a time: the calories of
+    each elf are added up with `np.add.reduceat` from one blank line to
+    the next one, and only the top `k` of them and those of the block
+    before are kept with `np.argpartition`. The elf at the end of a
+    block carries on in the next one.
+    """
+    top = np.zeros(0, dtype=np.int64)
+    carry_calories = 0
+    carry_has_items = False
+    with mapped(source_file) as buf:
+        # Blocks of about 1 MiB keep their arrays in the CPU caches,
+        # which makes them faster than larger ones.
+        for block_start, block_end in iter_blocks(buf, start, end):
+            # No name is kept for the array over the mapped file, as the
+            # file could not be unmapped while the array is alive.
+            values = parse_calories(np.frombuffer(
+                buf, dtype=np.uint8, count=block_end - block_start,
+                offset=block_start))
+            blank = values == BLANK
+            values[blank] = 0
+
+            # Each segment is an elf, or what is left of it, and the
+            # blank line ending it if any.
+            segment_starts = np.insert(np.flatnonzero(blank) + 1, 0, 0)
+            segment_starts = segment_starts[segment_starts < len(values)]
+            sums = np.add.reduceat(values, segment_starts)
+            num_items = np.diff(np.append(segment_starts, len(values))) - 1
+            if not blank[-1]:
+                num_items[-1] += 1  # No blank line ends the last one.
+
+            sums[0] += carry_calories
+            has_items = num_items > 0
+            has_items[0] |= carry_has_items
+
+            # The last segment goes on in the next block, unless the
+            # block ends with its blank line.
+            if blank[-1]:
+                carry_calories, carry_has_items = 0, False
+                complete = sums[has_items]
+            else:
+                carry_calories = int(sums[-1])
+                carry_has_items = bool(has_items[-1])
+                complete = sums[:-1][has_items[:-1]]
+            top = _top(np.concatenate((top, complete)), k)
+
+    if carry_has_items:  # The last elf, with no blank line after it.
+        top = _top(np.append(top, carry_calories), k)
+    return sorted(top.tolist(), reverse=True)
+
+
+def _top(calories, k):
+    if len(calories) <= k:
+        return calories
+    return calories[np.argpartition(calories, len(calories) - k)[-k:]]
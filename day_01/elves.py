@@ -0,0 +1,146 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import heapq
+from collections import namedtuple
+
+
+# An elf among the top ones: `rank` 1 is the one carrying the most
+# calories, and `elf` is the position of the elf in the input, from 1.
+RankedElf = namedtuple('RankedElf', ['rank', 'elf', 'calories'])
+
+
+class TopElves:
+    """The `k` elves carrying the most calories, kept as their lines come
+
+    Lines are the calories of the items of an elf, one per line, with a
+    blank line after the last item of each elf. Only the top `k` elves
+    are kept, in a min-heap, so the memory does not grow with the input
+    and each elf costs O(log k) at worst, and usually O(1) as most elves
+    are not among the top ones. Of elves carrying the same calories, the
+    one coming first ranks higher.
+
+    Lines can be given one at a time with `push()`, e.g. as they arrive,
+    and `snapshot()` tells the top elves so far at any moment:
+
+    >>> top = TopElves(k=2)
+    >>> for line in ['1000', '2000', '', '4000', '', '500']:
+    ...     top.push(line)
+    >>> for ranked_elf in top.snapshot():
+    ...     print(ranked_elf)
+    RankedElf(rank=1, elf=2, calories=4000)
+    RankedElf(rank=2, elf=1, calories=3000)
+
+    The last elf may not be followed by a blank line, so it only counts
+    once `close()` says there are no more lines:
+
+    >>> top.push('5000')
+    >>> top.close()
+    >>> for ranked_elf in top.snapshot():
+    ...     print(ranked_elf)
+    RankedElf(rank=1, elf=3, calories=5500)
+    RankedElf(rank=2, elf=2, calories=4000)
+    """
+
+    def __init__(self, k=3):
+        self.k = k
+        self.num_elves = 0
+        # Items are (calories, -elf), so that the root of the heap is
+        # the elf to drop first: the one with the fewest calories and,
+        # of those, the one coming last.
+        self._heap = []
+        self._current_calories = 0
+        self._current_has_items = False
+
+    def push(self, calories_line):
+        """Add a line, either the calories of an item or a blank line"""
+        if calories_line:
+            self._current_calories += int(calories_line)
+            self._current_has_items = True
+        else:
+            self._end_elf()
+
+    def extend(self, calories_data):
+        """Add all the lines, which is way faster than pushing each one
+
+        This is the same as `push()` for each line, but with all the state
+        in local variables, as this is the loop where all the time goes
+        when reading whole files.
+        """
+        heap = self._heap
+        k = self.k
+        num_elves = self.num_elves
+        current_calories = self._current_calories
+        has_items = self._current_has_items
+        for calories in calories_data:
+            if calories:
+                current_calories += int(calories)
+                has_items = True
+            elif has_items:
+                num_elves += 1
+                if len(heap) < k:
+                    heapq.heappush(heap, (current_calories, -num_elves))
+                elif current_calories > heap[0][0]:
+                    heapq.heapreplace(heap, (current_calories, -num_elves))
+                current_calories = 0
+                has_items = False
+        self.num_elves = num_elves
+        self._current_calories = current_calories
+        self._current_has_items = has_items
+
+    def close(self):
+        """Count the last elf, even if no blank line came after it"""
+        self._end_elf()
+
+    def _end_elf(self):
+        if not self._current_has_items:  # E.g. several blank lines.
+            return
+        self.num_elves += 1
+        item = (self._current_calories, -self.num_elves)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+        elif item[0] > self._heap[0][0]:  # Ties keep the first one.
+            heapq.heapreplace(self._heap, item)
+        self._current_calories = 0
+        self._current_has_items = False
+
+    def snapshot(self):
+        """The top elves so far, from the one with the most calories"""
+        return [
+            RankedElf(rank, -negative_elf, calories)
+            for rank, (calories, negative_elf) in enumerate(
+                sorted(self._heap, reverse=True), start=1)
+        ]
+
+    def calories(self):
+        """The calories of the top elves so far, from the most"""
+        return [calories for calories, _ in sorted(self._heap, reverse=True)]
+
+    def to_dict(self):
+        """All the state, as something that can be written as JSON
+
+        >>> top = TopElves(k=2)
+        >>> top.extend(['1', '', '2', '', '3'])
+        >>> state = top.to_dict()
+        >>> state['current_calories']
+        3
+        >>> TopElves.from_dict(state).snapshot() == top.snapshot()
+        True
+        """
+        return {
+            'k': self.k,
+            'num_elves': self.num_elves,
+            'heap': self._heap,
+            'current_calories': self._current_calories,
+            'current_has_items': self._current_has_items,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        top = cls(state['k'])
+        top.num_elves = state['num_elves']
+        # The list is still a heap, as the order of the items is kept.
+        top._heap = [tuple(item) for item in state['heap']]
+        top._current_calories = state['current_calories']
+        top._current_has_items = state['current_has_items']
+        return top
+
@@ -0,0 +1,219 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import argparse
+import json
+import os
+import select
+import sys
+import time
+
+from aoc.lines import NEWLINE, iter_blocks, mapped
+from elves import TopElves
+
+
+# Seconds between polls when the changes of the file cannot be watched,
+# and at most between updates when they can, just in case.
+DEFAULT_INTERVAL = 1.0
+
+
+class CaloriesFollower:
+    """The top elves of a file that keeps growing, updated as it grows
+
+    The state is the offset up to which the file has been read, always
+    at the beginning of a line, and the `TopElves` with the top elves so
+    far and the calories of the elf not yet ended by a blank line. Each
+    `update()` reads only the lines appended since, so it takes as long
+    as the new lines, no matter how large the file is. A line still being
+    written, with no newline yet, is left for the next update.
+
+    With a `checkpoint` file, the state is stored there after every
+    update and restored from there when starting, so following the file
+    again does not read it all again either. If the file was truncated
+    or replaced meanwhile, it is read again from the beginning.
+    """
+
+    def __init__(self, source_file, k=3, checkpoint=None):
+        self.source_file = source_file
+        self.checkpoint = checkpoint
+        self.k = k
+        self._reset(inode=None)
+        if checkpoint is not None:
+            self._load_checkpoint()
+
+    def _reset(self, inode):
+        self.inode = inode
+        self.offset = 0
+        self.top = TopElves(self.k)
+
+    def _load_checkpoint(self):
+        try:
+            with open(self.checkpoint) as f:
+                state = json.load(f)
+            if state['top']['k'] != self.k:
+                return
+            inode, offset = state['inode'], state['offset']
+            top = TopElves.from_dict(state['top'])
+        # No checkpoint yet, or a bad one: not JSON, or JSON of another
+        # shape. The file is then read again from the beginning.
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        self.inode = inode
+        self.offset = offset
+        self.top = top
+
+    def _save_checkpoint(self):
+        tmp_path = '%s.%d.tmp' % (self.checkpoint, os.getpid())
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'inode': self.inode,
+                'offset': self.offset,
+                'top': self.top.to_dict(),
+            }, f)
+        os.replace(tmp_path, self.checkpoint)
+
+    def update(self):
+        """Read the lines appended since the last update
+
+        Returns whether there were any.
+        """
+        try:
+            st = os.stat(self.source_file)
+        except FileNotFoundError:  # E.g. while it is being replaced.
+            return False
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            self._reset(st.st_ino)
+        if st.st_size == self.offset:
+            return False
+
+        with mapped(self.source_file) as buf:
+            end = buf.rfind(NEWLINE, self.offset) + 1
+            if end <= self.offset:  # Not even a whole line yet.
+                return False
+            for block_start, block_end in iter_blocks(buf, self.offset, end):
+                self.top.extend(buf[block_start:block_end].split(NEWLINE))
+        self.offset = end
+
+        if self.checkpoint is not None:
+            self._save_checkpoint()
+        return True
+
+
+class StatPoller:
+    """Waits for a file to change by looking at it every `interval`"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def wait(self, timeout):
+        time.sleep(timeout)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Waits for a file to change with inotify, only on Linux
+
+    There is no binding for inotify in the standard library, so this
+    calls the C library through ctypes.
+    """
+
+    IN_MODIFY = 0x002
+    IN_ATTRIB = 0x004
+    IN_CLOSE_WRITE = 0x008
+    IN_DELETE_SELF = 0x400
+    IN_MOVE_SELF = 0x800
+
+    def __init__(self, path):
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(
+            ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        mask = (self.IN_MODIFY | self.IN_ATTRIB | self.IN_CLOSE_WRITE |
+                self.IN_DELETE_SELF | self.IN_MOVE_SELF)
+        if libc.inotify_add_watch(self._fd, os.fsencode(path), mask) < 0:
+            os.close(self._fd)
+            raise OSError(ctypes.get_errno(), 'inotify_add_watch failed')
+
+    def wait(self, timeout):
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if ready:
+            # The events themselves do not matter, the file is looked at
+            # anyway, so they are just discarded.
+            try:
+                while os.read(self._fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self):
+        os.close(self._fd)
+
+
+def watch(path):
+    """The best way available here to wait for the file to change"""
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(path)
+        except (OSError, AttributeError):  # E.g. no inotify in the libc.
+            pass
+    return StatPoller(path)
+
+
+def follow(follower, on_update, interval=DEFAULT_INTERVAL):
+    """Call `on_update(follower)` now and every time the file grows
+
+    This never returns, stop it with Ctrl-C. The file is watched again
+    when it is replaced, e.g. when logs are rotated.
+    """
+    follower.update()
+    on_update(follower)
+    watcher = watch(follower.source_file)
+    try:
+        while True:
+            inode = follower.inode
+            watcher.wait(interval)
+            if follower.update():
+                on_update(follower)
+            if follower.inode != inode:
+                watcher.close()
+                watcher = watch(follower.source_file)
+    finally:
+        watcher.close()
+
+
+def print_top(follower):
+    top = follower.top
+    print('%d elves, %d bytes read: %s' % (
+        top.num_elves, follower.offset,
+        ', '.join('#%d elf %d (%d)' % elf for elf in top.snapshot())))
+    sys.stdout.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Follow a calories file, printing the top elves each '
+                    'time it grows.')
+    parser.add_argument('source_file', nargs='?', default='inputs/part_1.txt')
+    parser.add_argument('-k', type=int, default=3)
+    parser.add_argument(
+        '-c', '--checkpoint',
+        help='Keep the state in this file, to carry on from there later.')
+    parser.add_argument(
+        '-i', '--interval', type=float, default=DEFAULT_INTERVAL,
+        help='Seconds between polls, when the file cannot be watched.')
+    args = parser.parse_args(argv)
+
+    follower = CaloriesFollower(
+        args.source_file, k=args.k, checkpoint=args.checkpoint)
+    try:
+        follow(follower, print_top, interval=args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
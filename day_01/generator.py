@@ -0,0 +1,17 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import random
+
+
+def generate(out, size, seed=0):
+    """Write the calories carried by `size` elves to the file `out`
+
+    Each elf carries between 1 and 15 items, of 1000 to 60000 calories
+    each, and elves are separated by a blank line.
+    """
+    rng = random.Random(seed)
+    for elf_no in range(size):
+        if elf_no:
+            out.write('\n')
+        for _ in range(rng.randint(1, 15)):
+            out.write('%d\n' % rng.randint(1000, 60000))
@@ -1,38 +1,53 @@
 # Authored by Carlos Serra-Toro (https://carlosserratoro.com)
 # See the file LICENSE for the licence
-import os
+import functools
+
+from aoc.lines import iter_lines
+from aoc.mapreduce import BLANK_LINE, map_reduce
+from elves import TopElves
+
+
+# How the calories are added up: a line at a time, or a block of lines at
+# a time with NumPy, which is way faster but optional.
+BACKENDS = ('python', 'numpy')
 
 
 def get_calories_data(source_file):
-    with open(source_file) as f:
-        for line in f:
-            yield line.rstrip(os.linesep)
+    # Lines come as bytes, which `int()` parses as well as strings.
+    return iter_lines(source_file)
 
 
 def get_max_calories(calories_data):
     """Get the maximum amount of calories.
 
-    It receives a stream of calories data and checks,
-    once it has found a new chunk of calories, if its
-    sum is bigger than the maximum value that we had,
-    and if so updates.
+    It receives a stream of calories data, and keeps just the top elf
+    as the elves come, so the whole input is never in memory.
     """
+    top = TopElves(k=1)
+    top.extend(calories_data)
+    top.close()
+    return max(top.calories(), default=0)
+
+
+def get_max_calories_in_chunk(source_file, start, end, backend='python'):
+    if backend == 'numpy':
+        # Imported only when asked for, as NumPy may not be installed.
+        from calories_numpy import get_top_calories
+        return max(get_top_calories(source_file, 1, start, end), default=0)
+    return get_max_calories(iter_lines(source_file, start, end))
 
-    # Here the key is to not load the whole file into
-    # memory, but to process the lines one by one, because
-    # we don't know how long the input can be.
 
-    max_calories = 0
-    current_elf_calories = 0
-    for calories in calories_data:
-        if calories:
-            current_elf_calories += int(calories)
-        else:
-            if current_elf_calories > max_calories:
-                max_calories = current_elf_calories
-            current_elf_calories = 0
-    return max_calories
+def solve(source_file, jobs=1, backend='python'):
+    if backend not in BACKENDS:
+        raise ValueError('Unknown backend %r, use one of: %s' % (
+            backend, ', '.join(BACKENDS)))
+    # The elves of each chunk are independent of those of the others, so
+    # the maximum is the maximum of the maximums of the chunks.
+    return map_reduce(
+        source_file,
+        functools.partial(get_max_calories_in_chunk, backend=backend),
+        max, jobs=jobs, separator=BLANK_LINE)
 
 
 if __name__ == '__main__':
-    print(get_max_calories(get_calories_data('inputs/part_1.txt')))
+    print(solve('inputs/part_1.txt'))
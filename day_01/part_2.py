@@ -1,52 +1,60 @@
 # Authored by Carlos Serra-Toro (https://carlosserratoro.com)
 # See the file LICENSE for the licence
-import array
-import os
+import functools
+
+from aoc.lines import iter_lines
+from aoc.mapreduce import BLANK_LINE, map_reduce
+from elves import TopElves
+
+
+# How the calories are added up: a line at a time, or a block of lines at
+# a time with NumPy, which is way faster but optional.
+BACKENDS = ('python', 'numpy')
 
 
 def get_calories_data(source_file):
-    with open(source_file) as f:
-        for line in f:
-            yield line.rstrip(os.linesep)
+    # Lines come as bytes, which `int()` parses as well as strings.
+    return iter_lines(source_file)
 
 
-def get_top_three_max_calories(calories_data):
-    """Get the sum of the top-three maximum amount of calories.
+def get_top_three(calories_data):
+    """Get the top-three maximum amount of calories, from the most.
 
-    It receives a stream of calories data and checks,
-    once it has found a new chunk of calories, if its
-    sum is among the three maximum quantities that we
-    have found till now, and if so updates.
+    It receives a stream of calories data, and keeps just the top three
+    elves as the elves come, so the whole input is never in memory.
     """
+    top = TopElves(k=3)
+    top.extend(calories_data)
+    top.close()
+    return top.calories()
+
+
+def get_top_three_max_calories(calories_data):
+    """Get the sum of the top-three maximum amount of calories."""
+    return sum(get_top_three(calories_data))
+
 
-    # Here the key is to not load the whole file into
-    # memory, but to process the lines one by one, because
-    # we don't know how long the input can be.
+def get_top_three_in_chunk(source_file, start, end, backend='python'):
+    if backend == 'numpy':
+        # Imported only when asked for, as NumPy may not be installed.
+        from calories_numpy import get_top_calories
+        return get_top_calories(source_file, 3, start, end)
+    return get_top_three(iter_lines(source_file, start, end))
 
-    # Here it is key to find if we have found a new top-three
-    # quickly. To do so we keep the array in order so that just
-    # checking for the first element in the array is enough
-    # to know if we have a new maximum. Keeping it sorted is
-    # trivial being a 3-element array.
 
-    top_3 = array.array('L', [0, 0, 0])
+def merge_top_three(a, b):
+    return sorted(a + b, reverse=True)[:3]
 
-    current_elf_calories = 0
-    for calories in calories_data:
-        if calories:
-            current_elf_calories += int(calories)
-        else:
-            if current_elf_calories > top_3[0]:
-                # Float the new max till sorting is kept
-                top_3[0] = current_elf_calories
-                i = 1
-                while i < len(top_3) and top_3[i-1] > top_3[i]:
-                    top_3[i], top_3[i-1] = top_3[i-1], top_3[i]
-                    i += 1
 
-            current_elf_calories = 0
-    return sum(top_3)
+def solve(source_file, jobs=1, backend='python'):
+    if backend not in BACKENDS:
+        raise ValueError('Unknown backend %r, use one of: %s' % (
+            backend, ', '.join(BACKENDS)))
+    return sum(map_reduce(
+        source_file,
+        functools.partial(get_top_three_in_chunk, backend=backend),
+        merge_top_three, jobs=jobs, separator=BLANK_LINE))
 
 
 if __name__ == '__main__':
-    print(get_top_three_max_calories(get_calories_data('inputs/part_1.txt')))
+    print(solve('inputs/part_1.txt'))
@@ -0,0 +1,21 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import random
+import string
+
+
+def generate(out, size, seed=0, shapes=3):
+    """Write a strategy guide of `size` rounds to the file `out`
+
+    Games of more `shapes` (see `rules.CyclicGame`) use more letters,
+    from A on for the opponent and up to Z for you, which both parts
+    read (see `rules.ShapeStrategy` and `rules.OutcomeStrategy`).
+    """
+    rng = random.Random(seed)
+    rounds = [
+        '%s %s\n' % (a, b)
+        for a in string.ascii_uppercase[:shapes]
+        for b in string.ascii_uppercase[-shapes:]
+    ]
+    for _ in range(size):
+        out.write(rng.choice(rounds))
@@ -1,65 +1,57 @@
 # Authored by Carlos Serra-Toro (https://carlosserratoro.com)
 # See the file LICENSE for the licence
+import functools
+import operator
 
+from aoc.lines import iter_lines
+from aoc.mapreduce import map_reduce
+from rules import CompiledRules, ShapeStrategy, cyclic_game
+from scoring import score_file
 
-ITEM_ROCK = 'rock'
-ITEM_PAPER = 'paper'
-ITEM_SCISSORS = 'scissors'
 
+def parse_plays_data(lines):
+    for line in lines:
+        # Single ASCII characters are cached by Python, so this is
+        # not allocating any new strings.
+        opponent_play, your_play = chr(line[0]), chr(line[2])
+        yield opponent_play, your_play
 
-RESULT_YOU_WIN = 6
-RESULT_YOU_LOSE = 0
-RESULT_DRAW = 3
 
+def get_plays_data(source_file):
+    return parse_plays_data(iter_lines(source_file))
 
-MAP_LETTERS_TO_ITEMS = {
-    'A': ITEM_ROCK,
-    'B': ITEM_PAPER,
-    'C': ITEM_SCISSORS,
-    'X': ITEM_ROCK,
-    'Y': ITEM_PAPER,
-    'Z': ITEM_SCISSORS,
-}
 
+def get_score_table(shapes=3):
+    """The score of every round of the game of `shapes` shapes
 
-YOUR_SHAPE = {
-    ITEM_ROCK: 1,
-    ITEM_PAPER: 2,
-    ITEM_SCISSORS: 3,
-}
+    Your letter is the shape you play, see `rules.ShapeStrategy`.
+    """
+    return CompiledRules(cyclic_game(shapes), ShapeStrategy()).score_table
 
 
-def get_plays_data(source_file):
-    with open(source_file) as f:
-        for line in f:
-            opponent_play, your_play = line[0], line[2]
-            yield opponent_play, your_play
-
-
-def get_result(opponent_item, your_item):
-    """Get the result of the interaction between opponent's and your items"""
-    if opponent_item == your_item:
-        result = RESULT_DRAW
-    elif (
-        opponent_item == ITEM_ROCK and your_item == ITEM_SCISSORS
-        or opponent_item == ITEM_SCISSORS and your_item == ITEM_PAPER
-        or opponent_item == ITEM_PAPER and your_item == ITEM_ROCK
-    ):
-        result = RESULT_YOU_LOSE
-    else:
-        result = RESULT_YOU_WIN
-    return result
+# There are only 9 possible rounds, so each one is scored just once.
+SCORE_TABLE = get_score_table()
 
 
 def get_total_score(plays_data):
     total_score = 0
-    for opponent_play, your_play in plays_data:
-        opponent_item = MAP_LETTERS_TO_ITEMS[opponent_play]
-        your_item = MAP_LETTERS_TO_ITEMS[your_play]
-        result = get_result(opponent_item, your_item)
-        total_score += result + YOUR_SHAPE[your_item]
+    for play in plays_data:
+        total_score += SCORE_TABLE[play]
     return total_score
 
 
+def get_total_score_in_chunk(source_file, start, end,
+                             score_table=SCORE_TABLE):
+    return score_file(source_file, score_table, start, end)
+
+
+def solve(source_file, jobs=1, shapes=3):
+    score_table = get_score_table(shapes)
+    return map_reduce(
+        source_file,
+        functools.partial(get_total_score_in_chunk, score_table=score_table),
+        operator.add, jobs=jobs)
+
+
 if __name__ == '__main__':
-    print(get_total_score(get_plays_data('inputs/part_1_2.txt')))
+    print(solve('inputs/part_1_2.txt'))
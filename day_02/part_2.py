@@ -1,72 +1,75 @@
 # Authored by Carlos Serra-Toro (https://carlosserratoro.com)
 # See the file LICENSE for the licence
+import functools
+import operator
 
+from aoc.lines import iter_lines
+from aoc.mapreduce import map_reduce
+from rules import CompiledRules, OutcomeStrategy, cyclic_game
+from scoring import score_file
 
-ITEM_ROCK = 'rock'
-ITEM_PAPER = 'paper'
-ITEM_SCISSORS = 'scissors'
 
+def parse_plays_data(lines):
+    for line in lines:
+        # Single ASCII characters are cached by Python, so this is
+        # not allocating any new strings.
+        opponents_play, play_outcome = chr(line[0]), chr(line[2])
+        yield opponents_play, play_outcome
 
-RESULT_YOU_WIN = 6
-RESULT_YOU_LOSE = 0
-RESULT_DRAW = 3
 
+def get_plays_data(source_file):
+    return parse_plays_data(iter_lines(source_file))
 
-MAP_LETTERS_TO_ITEMS = {
-    'A': ITEM_ROCK,
-    'B': ITEM_PAPER,
-    'C': ITEM_SCISSORS,
-}
 
+def get_score_table(shapes=3):
+    """The score of every round of the game of `shapes` shapes
 
-MAP_LETTERS_TO_RESULT = {
-    'X': RESULT_YOU_LOSE,
-    'Y': RESULT_DRAW,
-    'Z': RESULT_YOU_WIN,
-}
+    Your letter is how the round must end, and with more than 3 shapes
+    by how far, see `rules.OutcomeStrategy`.
+    """
+    return CompiledRules(cyclic_game(shapes), OutcomeStrategy()).score_table
 
 
-YOUR_SHAPE = {
-    ITEM_ROCK: 1,
-    ITEM_PAPER: 2,
-    ITEM_SCISSORS: 3,
-}
+# There are only 9 possible rounds, so each one is scored just once.
+SCORE_TABLE = get_score_table()
 
 
-GAME_LOGIC = {
-    ITEM_ROCK: {'beats': ITEM_SCISSORS, 'defeated_by': ITEM_PAPER},
-    ITEM_PAPER: {'beats': ITEM_ROCK, 'defeated_by': ITEM_SCISSORS},
-    ITEM_SCISSORS: {'beats': ITEM_PAPER, 'defeated_by': ITEM_ROCK},
-}
+def get_total_score(plays_data):
+    total_score = 0
+    for play in plays_data:
+        total_score += SCORE_TABLE[play]
+    return total_score
 
 
-def get_plays_data(source_file):
-    with open(source_file) as f:
-        for line in f:
-            opponents_play, play_outcome = line[0], line[2]
-            yield opponents_play, play_outcome
+def get_total_score_in_chunk(source_file, start, end,
+                             score_table=SCORE_TABLE):
+    return score_file(source_file, score_table, start, end)
 
 
-def get_your_item(opponent_item, result):
-    """Get what to play given your opponent's play to get the result"""
-    if result == RESULT_DRAW:
-        your_item = opponent_item
-    elif result == RESULT_YOU_WIN:
-        your_item = GAME_LOGIC[opponent_item]['defeated_by']
-    else:  # if result == RESULT_YOU_LOSE:
-        your_item = GAME_LOGIC[opponent_item]['beats']
-    return your_item
+def solve(source_file, jobs=1, shapes=3):
+    """The total score of the strategy guide, for a game of `shapes` shapes
 
+    Generated inputs of more shapes have as many outcome letters:
 
-def get_total_score(plays_data):
-    total_score = 0
-    for opponents_play, play_outcome in plays_data:
-        opponent_item = MAP_LETTERS_TO_ITEMS[opponents_play]
-        result = MAP_LETTERS_TO_RESULT[play_outcome]
-        your_item = get_your_item(opponent_item, result)
-        total_score += result + YOUR_SHAPE[your_item]
-    return total_score
+    >>> import os, tempfile, generator
+    >>> with tempfile.NamedTemporaryFile('w', delete=False) as f:
+    ...     generator.generate(f, 1000, shapes=5)
+    >>> with open(f.name) as lines:
+    ...     rounds = [('ABCDE'.index(line[0]), 'VWXYZ'.index(line[2]) - 2)
+    ...               for line in lines]
+    >>> game = cyclic_game(5)
+    >>> solve(f.name, shapes=5) == sum(
+    ...     game.score(opponent, (opponent + step) % 5)
+    ...     for opponent, step in rounds)
+    True
+    >>> os.remove(f.name)
+    """
+    score_table = get_score_table(shapes)
+    return map_reduce(
+        source_file,
+        functools.partial(get_total_score_in_chunk, score_table=score_table),
+        operator.add, jobs=jobs)
 
 
 if __name__ == '__main__':
-    print(get_total_score(get_plays_data('inputs/part_1_2.txt')))
+    print(solve('inputs/part_1_2.txt'))
@@ -0,0 +1,189 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import string
+
+
+LOSE = 'lose'
+DRAW = 'draw'
+WIN = 'win'
+
+DEFAULT_OUTCOME_SCORES = {LOSE: 0, DRAW: 3, WIN: 6}
+
+
+class CyclicGame:
+    """A game of N shapes in a cycle, each one beating the N // 2 before
+
+    Rock, paper and scissors is the game of 3 shapes, where each shape
+    beats the one before it in the cycle, and rock, Spock, paper, lizard
+    and scissors is the game of 5 shapes, where each beats the 2 before.
+    N must be odd, or a shape and the one opposite to it in the cycle
+    would beat each other. Each shape scores its position, from 1.
+
+    The outcome of every pair of shapes is computed once, in the dense
+    matrix `outcomes[opponent_shape][your_shape]`, of shape indices.
+
+    >>> game = CyclicGame(['rock', 'paper', 'scissors'])
+    >>> game.outcomes[0]
+    ['draw', 'win', 'lose']
+    """
+
+    def __init__(self, shapes, outcome_scores=None):
+        if len(shapes) < 3 or len(shapes) % 2 == 0:
+            raise ValueError(
+                'A cyclic game needs an odd number of shapes, not %d' %
+                len(shapes))
+        self.shapes = list(shapes)
+        self.outcome_scores = outcome_scores or DEFAULT_OUTCOME_SCORES
+        self.shape_scores = list(range(1, len(shapes) + 1))
+        n = len(shapes)
+        self.outcomes = [
+            [self._outcome(opponent, you, n) for you in range(n)]
+            for opponent in range(n)
+        ]
+
+    @staticmethod
+    def _outcome(opponent, you, n):
+        distance = (you - opponent) % n
+        if distance == 0:
+            return DRAW
+        return WIN if distance <= n // 2 else LOSE
+
+    def score(self, opponent, you):
+        return (self.outcome_scores[self.outcomes[opponent][you]] +
+                self.shape_scores[you])
+
+
+ROCK_PAPER_SCISSORS = CyclicGame(['rock', 'paper', 'scissors'])
+
+ROCK_PAPER_SCISSORS_LIZARD_SPOCK = CyclicGame(
+    ['rock', 'spock', 'paper', 'lizard', 'scissors'])
+
+NAMED_GAMES = [ROCK_PAPER_SCISSORS, ROCK_PAPER_SCISSORS_LIZARD_SPOCK]
+
+
+def cyclic_game(num_shapes):
+    """The game of `num_shapes` shapes, with names if it has any
+
+    >>> cyclic_game(5) is ROCK_PAPER_SCISSORS_LIZARD_SPOCK
+    True
+    >>> cyclic_game(7).shapes[-1]
+    'shape 7'
+    """
+    for game in NAMED_GAMES:
+        if len(game.shapes) == num_shapes:
+            return game
+    return CyclicGame(['shape %d' % i for i in range(1, num_shapes + 1)])
+
+
+def _letters(n, last=False):
+    """The first `n` letters, or the last ones
+
+    >>> _letters(3), _letters(3, last=True)
+    ('ABC', 'XYZ')
+    """
+    letters = string.ascii_uppercase
+    return letters[-n:] if last else letters[:n]
+
+
+class ShapeStrategy:
+    """Your letter is the shape you play, as in part 1
+
+    Letters are given in the order of the shapes of the game, by default
+    A, B, C... for the opponent and ...X, Y, Z for you.
+    """
+
+    def __init__(self, opponent_letters=None, your_letters=None):
+        self.opponent_letters = opponent_letters
+        self.your_letters = your_letters
+
+    def decode(self, game):
+        """Map each pair of letters to the pair of shapes they stand for"""
+        n = len(game.shapes)
+        opponent_letters = self.opponent_letters or _letters(n)
+        your_letters = self.your_letters or _letters(n, last=True)
+        return {
+            (o, y): (opponent, you)
+            for opponent, o in enumerate(opponent_letters)
+            for you, y in enumerate(your_letters)
+        }
+
+
+class OutcomeStrategy:
+    """Your letter is how the round must end, as in part 2
+
+    The letters go from the worst loss to the best win, the one in the
+    middle being a draw: X, Y and Z lose, draw and win by default with 3
+    shapes. Games of more shapes have more ways to win and to lose, and
+    by default as many letters as shapes, the last ones as for the
+    shapes of part 1, e.g. V, W, X, Y and Z with 5: the further a letter
+    from the middle, the further the shape you play from the opponent's
+    in the cycle. With fewer letters than shapes, you play the closest
+    ones to the opponent's shape: the one just after it to win, just
+    before it to lose.
+
+    >>> game = ROCK_PAPER_SCISSORS_LIZARD_SPOCK
+    >>> rounds = OutcomeStrategy().decode(game)
+    >>> rounds['A', 'V'], rounds['A', 'X'], rounds['A', 'Z']
+    ((0, 3), (0, 0), (0, 2))
+    >>> OutcomeStrategy(outcome_letters='XYZ').decode(game)['A', 'Z']
+    (0, 1)
+    """
+
+    def __init__(self, opponent_letters=None, outcome_letters=None):
+        if outcome_letters is not None and len(outcome_letters) % 2 == 0:
+            raise ValueError(
+                'An odd number of outcome letters is needed, not %d' %
+                len(outcome_letters))
+        self.opponent_letters = opponent_letters
+        self.outcome_letters = outcome_letters
+
+    def decode(self, game):
+        n = len(game.shapes)
+        opponent_letters = self.opponent_letters or _letters(n)
+        outcome_letters = self.outcome_letters or _letters(n, last=True)
+        if len(outcome_letters) > n:
+            raise ValueError('%d outcome letters for a game of %d shapes' % (
+                len(outcome_letters), n))
+        # How many shapes after the opponent's one you play, for each
+        # letter: less than 0 to lose, 0 to draw and more than 0 to win.
+        middle = len(outcome_letters) // 2
+        return {
+            (o, y): (opponent, (opponent + step - middle) % n)
+            for opponent, o in enumerate(opponent_letters)
+            for step, y in enumerate(outcome_letters)
+        }
+
+
+class CompiledRules:
+    """A game and a strategy, as the score of every possible round
+
+    Compiling does all the work once, for at most N * N rounds, so that
+    scoring is just looking the rounds up: the dense matrix `scores` is
+    indexed by the position of the letters of a round in the strategy,
+    and `score_table` maps the letters themselves to the score, as
+    `scoring.score_file()` expects.
+
+    >>> rules = CompiledRules(ROCK_PAPER_SCISSORS, ShapeStrategy())
+    >>> rules.scores
+    [[4, 8, 3], [1, 5, 9], [7, 2, 6]]
+    >>> rules = CompiledRules(ROCK_PAPER_SCISSORS, OutcomeStrategy())
+    >>> rules.scores
+    [[3, 4, 8], [1, 5, 9], [2, 6, 7]]
+    >>> rules.score_table['A', 'Y']
+    4
+    """
+
+    def __init__(self, game, strategy):
+        self.game = game
+        self.strategy = strategy
+        rounds = strategy.decode(game)
+        self.opponent_letters = list(dict.fromkeys(o for o, _ in rounds))
+        self.your_letters = list(dict.fromkeys(y for _, y in rounds))
+        self.score_table = {
+            letters: game.score(opponent, you)
+            for letters, (opponent, you) in rounds.items()
+        }
+        self.scores = [
+            [self.score_table[o, y] for y in self.your_letters]
+            for o in self.opponent_letters
+        ]
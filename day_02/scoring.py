@@ -0,0 +1,36 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+from aoc.lines import NEWLINE, iter_blocks, mapped
+
+
+def count_rounds(source_file, rounds, start=0, end=None):
+    """Count how many times each of the rounds is in the file
+
+    Each round is a line with the two letters and a space between them,
+    which can only be at the beginning of a line, so counting them
+    with `bytes.count` over a block of lines at a time is just a scan of
+    memory per round, way faster than going through the lines. Only the
+    lines between the offsets `start` and `end` are counted.
+    """
+    patterns = [(r, ('%s %s' % r).encode('ascii')) for r in rounds]
+    counts = dict.fromkeys(rounds, 0)
+    with mapped(source_file) as buf:
+        for block_start, block_end in iter_blocks(buf, start, end):
+            block = buf[block_start:block_end]
+            num_counted = 0
+            for r, pattern in patterns:
+                count = block.count(pattern)
+                counts[r] += count
+                num_counted += count
+            num_lines = block.count(NEWLINE) + 1
+            if num_counted != num_lines:
+                raise ValueError(
+                    'Unknown rounds between the offsets %d and %d of %s' % (
+                        block_start, block_end, source_file))
+    return counts
+
+
+def score_file(source_file, score_table, start=0, end=None):
+    """The total score of the rounds in the file, a dot product"""
+    counts = count_rounds(source_file, score_table, start, end)
+    return sum(counts[r] * score for r, score in score_table.items())
@@ -0,0 +1,55 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import random
+import string
+
+
+ITEMS = string.ascii_letters
+
+RUCKSACKS_PER_GROUP = 3
+
+
+def _rucksack(rng, pool, badge):
+    """A rucksack with items from `pool` and the `badge`
+
+    Both compartments share exactly one item, and the badge is in one
+    of them (or is the shared item).
+    """
+    shared = rng.choice(pool + [badge])
+    others = [item for item in pool + [badge] if item != shared]
+    rng.shuffle(others)
+    first_items = others[:len(others) // 2]
+    second_items = others[len(others) // 2:]
+
+    num_items = rng.randint(8, 16)
+    first = [shared] + rng.choices(first_items, k=num_items - 1)
+    second = [shared] + rng.choices(second_items, k=num_items - 1)
+    if shared != badge:
+        compartment = first if badge in first_items else second
+        compartment[rng.randrange(1, num_items)] = badge
+    rng.shuffle(first)
+    rng.shuffle(second)
+    return ''.join(first) + ''.join(second)
+
+
+def generate(out, size, seed=0, group_size=RUCKSACKS_PER_GROUP):
+    """Write `size` rucksacks to the file `out`
+
+    The number of rucksacks is rounded up to whole groups of
+    `group_size`. The items not being the badge are split among the
+    rucksacks of the group without repetition, so that the badge is the
+    only item they all have in common.
+    """
+    rng = random.Random(seed)
+    pool_size = (len(ITEMS) - 1) // group_size
+    if pool_size < 2:
+        raise ValueError('Groups of %d rucksacks cannot have a single badge'
+                         % group_size)
+    num_groups = -(-size // group_size)
+    for _ in range(num_groups):
+        badge = rng.choice(ITEMS)
+        items = [item for item in ITEMS if item != badge]
+        rng.shuffle(items)
+        for i in range(group_size):
+            pool = items[i * pool_size:(i + 1) * pool_size]
+            out.write(_rucksack(rng, pool, badge) + '\n')
@@ -0,0 +1,41 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import string
+
+
+# Items are identified by a letter in [A-Za-z], in order of priority.
+ITEMS = string.ascii_lowercase + string.ascii_uppercase
+
+
+def _make_item_bits():
+    bits = [0] * 256
+    for priority, letter in enumerate(ITEMS, start=1):
+        bits[ord(letter)] = 1 << (priority - 1)
+    return bits
+
+
+# The bit of each item, by the byte of its letter, in the masks that are
+# the sets of items. Any other byte has no bit.
+ITEM_BITS = _make_item_bits()
+
+# The set of all the items, which is where intersections start from.
+ALL_ITEMS = (1 << len(ITEMS)) - 1
+
+
+def items_mask(items):
+    """The set of items given as bytes, as a mask of 52 bits
+
+    Each item is the bit of its priority minus one, so the intersection
+    of two sets is `a & b`, and the priority of the only item in a set is
+    `mask.bit_length()`. Repeated items are dropped with `set()` before
+    adding up the bits, which is then the same as OR-ing them, and both
+    are done in C, not in a loop per item.
+
+    >>> bin(items_mask(b'abba'))
+    '0b11'
+    >>> (items_mask(b'vJrwpW') & items_mask(b'hcsFMsfFp')).bit_length()
+    16
+    >>> items_mask(b'Z').bit_length()
+    52
+    """
+    return sum(map(ITEM_BITS.__getitem__, set(items)))
@@ -1,35 +1,25 @@
 # Authored by Carlos Serra-Toro (https://carlosserratoro.com)
 # See the file LICENSE for the licence
-import array
-import os
+import functools
+import operator
 
+from aoc.lines import iter_lines
+from aoc.mapreduce import map_reduce
+from itemsets import items_mask
 
-# Items are identified by a letter in [A-Za-z]
-NUM_ITEMS = (ord('Z') - ord('A') + 1) * 2
 
-
-def get_rucksacks_data(source_file):
-    with open(source_file) as f:
-        for line in f:
-            yield line.rstrip(os.linesep)
+# How the items are looked up: a line at a time, or a block of lines at
+# a time with NumPy, which is way faster but optional.
+BACKENDS = ('python', 'numpy')
 
 
-def letter_to_index(letter):
-    """Given a letter in [A-Za-z] return a unique indexing position"""
-    if letter <= 'Z':
-        index = ord(letter) - ord('A')
-    else:
-        offset_uppercase_z = ord('Z') - ord('A') + 1
-        index = ord(letter) - ord('a') + offset_uppercase_z
-    return index
+def parse_rucksacks_data(lines):
+    # The items are looked up by their bytes, so lines are not decoded.
+    return lines
 
 
-def letter_to_priority(letter):
-    if letter <= 'Z':  # letter in [A-Z]
-        priority = ord(letter) - ord('A') + NUM_ITEMS//2 + 1
-    else:  # letter in [a-z]
-        priority = ord(letter) - ord('a') + 1
-    return priority
+def get_rucksacks_data(source_file):
+    return parse_rucksacks_data(iter_lines(source_file))
 
 
 def get_sum_of_priorities(rucksacks_data):
@@ -38,29 +28,35 @@ def get_sum_of_priorities(rucksacks_data):
     sum_of_priorities = 0
 
     for rucksack in rucksacks_data:
-        item_count = array.array('b', (0 for _ in range(NUM_ITEMS)))
-
-        # Find which items we have in the first compartment, which is
-        # in the first half of the rucksack.
-        i = 0
-        while i < len(rucksack) // 2:
-            letter = rucksack[i]
-            item_count[letter_to_index(letter)] += 1
-            i += 1
-
-        # Iterate through the second compartment, which is in the second
-        # half of the rucksack, to find the item that is also in the first
-        # compartment.
-        shared_item_found = False
-        while i < len(rucksack) and not shared_item_found:
-            letter = rucksack[i]
-            if item_count[letter_to_index(letter)] > 0:  # Item found.
-                sum_of_priorities += letter_to_priority(letter)
-                shared_item_found = True
-            i += 1
+        # Each compartment is a set of items, and the only item in both
+        # of them is in their intersection, whose length in bits is the
+        # priority of the item (or 0 if there is none).
+        half = len(rucksack) // 2
+        first, second = rucksack[:half], rucksack[half:]
+        shared_items = items_mask(first) & items_mask(second)
+        sum_of_priorities += shared_items.bit_length()
 
     return sum_of_priorities
 
 
+def get_sum_of_priorities_in_chunk(source_file, start, end, backend='python'):
+    if backend == 'numpy':
+        # Imported only when asked for, as NumPy may not be installed.
+        from rucksacks_numpy import get_sum_of_priorities as numpy_sum
+        return numpy_sum(source_file, start, end)
+    lines = iter_lines(source_file, start, end)
+    return get_sum_of_priorities(parse_rucksacks_data(lines))
+
+
+def solve(source_file, jobs=1, backend='python'):
+    if backend not in BACKENDS:
+        raise ValueError('Unknown backend %r, use one of: %s' % (
+            backend, ', '.join(BACKENDS)))
+    return map_reduce(
+        source_file,
+        functools.partial(get_sum_of_priorities_in_chunk, backend=backend),
+        operator.add, jobs=jobs)
+
+
 if __name__ == '__main__':
-    print(get_sum_of_priorities(get_rucksacks_data('inputs/part_1_2.txt')))
+    print(solve('inputs/part_1_2.txt'))
@@ -0,0 +1,121 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import numpy as np
+
+from aoc.lines import iter_blocks, mapped
+from itemsets import ALL_ITEMS, ITEM_BITS
+
+
+# The bit of each item by the byte of its letter, as in `itemsets`, so
+# that a block of bytes is turned into a block of bits with one `take`.
+ITEM_BITS_TABLE = np.array(ITEM_BITS, dtype=np.uint64)
+
+NEWLINE = ord('\n')
+
+
+def item_bits(block):
+    """The bit of the item of each byte of the block, and a 0 after them
+
+    Newlines and any other bytes that are not items have no bit, so
+    OR-ing the bits of a line and the newline after it is the set of
+    items of the line. The 0 at the end is where an empty last line,
+    with no newline after it, starts.
+
+    >>> item_bits(np.frombuffer(b'ab\\nA', dtype=np.uint8)).tolist()
+    [1, 2, 0, 67108864, 0]
+    """
+    bits = np.empty(len(block) + 1, dtype=np.uint64)
+    ITEM_BITS_TABLE.take(block, out=bits[:-1])
+    bits[-1] = 0
+    return bits
+
+
+def line_bounds(block):
+    """The offsets where each line of the block starts, and their lengths
+
+    >>> starts, lengths = line_bounds(
+    ...     np.frombuffer(b'abcd\\n\\nef', dtype=np.uint8))
+    >>> starts.tolist(), lengths.tolist()
+    ([0, 5, 6], [4, 0, 2])
+    """
+    newlines = np.flatnonzero(block == NEWLINE)
+    starts = np.insert(newlines + 1, 0, 0)
+    lengths = np.append(newlines, len(block)) - starts
+    return starts, lengths
+
+
+def priorities(masks):
+    """The priority of the highest item of each set, 0 for an empty one
+
+    This is `mask.bit_length()` for a whole array at once: masks have
+    52 bits at most, so they are exact as floats, and the exponent of a
+    float is its length in bits.
+
+    >>> masks = np.array([0, 1, 2 ** 15, 2 ** 51], dtype=np.uint64)
+    >>> priorities(masks).tolist()
+    [0, 1, 16, 52]
+    """
+    return np.frexp(masks.astype(np.float64))[1]
+
+
+def _iter_blocks(source_file, start, end):
+    with mapped(source_file) as buf:
+        for block_start, block_end in iter_blocks(buf, start, end):
+            # Blocks are copied out of the mapped file, as it could not
+            # be unmapped while an array over it is alive, and the caller
+            # holds on to the last one.
+            yield np.frombuffer(
+                buf, dtype=np.uint8, count=block_end - block_start,
+                offset=block_start).copy()
+
+
+def get_sum_of_priorities(source_file, start=0, end=None):
+    """Get the sum of priorities of the items in both compartments
+
+    This is the same as `part_1.get_sum_of_priorities` does for the
+    lines between the offsets `start` and `end`, but a block at a time:
+    the bits of the items of each half of every line are OR-ed at once
+    with `np.bitwise_or.reduceat`, from the start of the line to its
+    middle and from there to the start of the next line, and the two
+    sets of every line are AND-ed at once too.
+    """
+    total = 0
+    for block in _iter_blocks(source_file, start, end):
+        bits = item_bits(block)
+        starts, lengths = line_bounds(block)
+        middles = starts + lengths // 2
+        halves = np.bitwise_or.reduceat(
+            bits, np.column_stack((starts, middles)).ravel())
+        first, second = halves[0::2], halves[1::2]
+        # An empty segment takes the bit at its start instead of none,
+        # which is a newline for an empty second half, but the first
+        # item of the line for an empty first half.
+        first[lengths < 2] = 0
+        total += int(priorities(first & second).sum())
+    return total
+
+
+def get_sum_of_badges(source_file, group_size, start=0, end=None):
+    """Get the sum of priorities of the badges of each group of elves
+
+    This is the same as `part_2.get_sum_of_badges` does for the lines
+    between the offsets `start` and `end`, but a block at a time: the
+    set of items of every line is OR-ed at once, and the sets of each
+    group of `group_size` lines are AND-ed at once, as the rows of a
+    matrix. The lines of a group not ended in a block carry on in the
+    next one.
+    """
+    total = 0
+    carry = np.zeros(0, dtype=np.uint64)
+    for block in _iter_blocks(source_file, start, end):
+        starts, _ = line_bounds(block)
+        masks = np.bitwise_or.reduceat(item_bits(block), starts)
+        masks = np.concatenate((carry, masks))
+        num_grouped = len(masks) - len(masks) % group_size
+        carry = masks[num_grouped:]
+        badges = np.bitwise_and.reduce(
+            masks[:num_grouped].reshape(-1, group_size), axis=1,
+            initial=ALL_ITEMS)
+        total += int(priorities(badges).sum())
+    # A last group with fewer rucksacks than the others is left out.
+    return total
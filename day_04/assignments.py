@@ -0,0 +1,242 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import argparse
+import bisect
+from array import array
+from itertools import chain
+
+from sections import iter_sections
+
+
+class AssignmentIndex:
+    """The ranges of sections of all the elves, indexed by their sections
+
+    The parts only compare the two ranges of each line, while this
+    answers questions about the whole roster: which elves cover a
+    section, which assignments overlap a range, and how many pairs of
+    elves overlap, with no need to compare every pair.
+
+    The elf `i` is the first one of the line `i // 2` if `i` is even and
+    the second one otherwise, both from 0. The index is built once, in
+    O(n log n), as an interval tree: each node holds the ranges that
+    contain its center, sorted by their starts and by their ends, and
+    the ranges left of the center and right of it are in two subtrees.
+    Queries then go down a single path, scanning at each node only the
+    ranges that are reported, so they take O(log n + k) for k elves,
+    plus sorting them.
+
+    >>> index = AssignmentIndex([2, 6, 2, 4, 5, 7], [4, 8, 3, 5, 7, 9])
+    >>> index.covering(4)
+    [0, 3]
+    >>> index.overlapping(3, 5)
+    [0, 2, 3, 4]
+    >>> index.count_covering(7), index.count_overlapping(3, 5)
+    (3, 4)
+    >>> index.count_overlapping_pairs()
+    6
+    """
+
+    def __init__(self, starts, ends):
+        if len(starts) != len(ends):
+            raise ValueError('%d starts of ranges but %d ends' % (
+                len(starts), len(ends)))
+        self.starts = array('q', starts)
+        self.ends = array('q', ends)
+        by_start = sorted(
+            range(len(self.starts)), key=self.starts.__getitem__)
+        # The starts and the ends on their own, sorted, for counting.
+        self.sorted_starts = array('q', map(self.starts.__getitem__,
+                                            by_start))
+        self.sorted_ends = array('q', sorted(self.ends))
+        # The elves by their starts, to report the ranges that start
+        # within a range of sections.
+        self.by_start = array('q', by_start)
+        self.root = self._build(by_start)
+
+    @classmethod
+    def from_file(cls, source_file):
+        """Index the ranges of both elves of every line of a file"""
+        starts, ends = array('q'), array('q')
+        for a_start, a_end, b_start, b_end in iter_sections(source_file):
+            # The elves of each line, one after the other.
+            starts.extend(chain.from_iterable(zip(a_start, b_start)))
+            ends.extend(chain.from_iterable(zip(a_end, b_end)))
+        return cls(starts, ends)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _build(self, by_start):
+        """Build the subtree of the elves, given sorted by their starts
+
+        A node is a list of its center, the elves containing it by their
+        starts, their starts, the same elves by their ends from the last
+        and their ends, and the subtrees before and after the center. The
+        center is the start of the median elf, so that at most half of
+        the elves are on each side and the tree is O(log n) deep. The
+        elves on each side stay sorted by their starts as they are split,
+        and the building is done with a stack instead of recursion.
+        """
+        starts, ends = self.starts, self.ends
+        root = [None]
+        stack = [(root, 0, by_start)]
+        while stack:
+            parent, slot, elves = stack.pop()
+            if not elves:
+                continue
+            center = starts[elves[len(elves) // 2]]
+            before, here, after = [], [], []
+            for elf in elves:
+                if ends[elf] < center:
+                    before.append(elf)
+                elif starts[elf] > center:
+                    after.append(elf)
+                else:
+                    here.append(elf)
+            here_by_end = sorted(here, key=ends.__getitem__, reverse=True)
+            node = [
+                center,
+                here, [starts[elf] for elf in here],
+                here_by_end, [ends[elf] for elf in here_by_end],
+                None, None,
+            ]
+            parent[slot] = node
+            stack.append((node, 5, before))
+            stack.append((node, 6, after))
+        return root[0]
+
+    def covering(self, section):
+        """The elves whose ranges contain the section, in order"""
+        found = []
+        node = self.root
+        while node is not None:
+            center, here, here_starts, here_by_end, here_ends, before, \
+                after = node
+            if section < center:
+                # All of them end after the section, so those that start
+                # before it contain it, and they are the first ones.
+                found.extend(here[:bisect.bisect_right(here_starts, section)])
+                node = before
+            elif section > center:
+                # Likewise, all of them start before the section.
+                num_found = 0
+                for end in here_ends:
+                    if end < section:
+                        break
+                    num_found += 1
+                found.extend(here_by_end[:num_found])
+                node = after
+            else:
+                found.extend(here)
+                break
+        found.sort()
+        return found
+
+    def overlapping(self, first, last):
+        """The elves whose ranges overlap the range `first-last`, in order
+
+        These are the elves covering the first section, and those whose
+        ranges start after it and not after the last section, which are
+        next to each other in the elves by their starts.
+        """
+        _check_range(first, last)
+        found = self.covering(first)
+        found.extend(self.by_start[
+            bisect.bisect_right(self.sorted_starts, first):
+            bisect.bisect_right(self.sorted_starts, last)])
+        found.sort()
+        return found
+
+    def count_covering(self, section):
+        """How many elves cover the section, in O(log n)"""
+        return self.count_overlapping(section, section)
+
+    def count_overlapping(self, first, last):
+        """How many elves overlap the range `first-last`, in O(log n)
+
+        All the elves but those starting after the last section or
+        ending before the first one, which are never the same ones.
+        """
+        _check_range(first, last)
+        return (bisect.bisect_right(self.sorted_starts, last) -
+                bisect.bisect_left(self.sorted_ends, first))
+
+    def count_overlapping_pairs(self):
+        """How many pairs of elves overlap, out of all the possible pairs
+
+        Two ranges do not overlap when one of them ends before the other
+        one starts, so each pair that does not overlap is counted once by
+        counting, for every elf, the elves ending before its start. This
+        is a sweep over the sorted starts and ends, in O(n log n) for the
+        sorting instead of comparing the O(n^2) pairs.
+        """
+        n = len(self)
+        num_disjoint = 0
+        num_ended = 0
+        ends = self.sorted_ends
+        for start in self.sorted_starts:
+            while num_ended < n and ends[num_ended] < start:
+                num_ended += 1
+            num_disjoint += num_ended
+        return n * (n - 1) // 2 - num_disjoint
+
+
+def _check_range(first, last):
+    if first > last:
+        raise ValueError('The range %d-%d ends before it starts' % (
+            first, last))
+
+
+def _elf(index, elf):
+    return 'line %d, elf %d: %d-%d' % (
+        elf // 2 + 1, elf % 2 + 1, index.starts[elf], index.ends[elf])
+
+
+def _section_range(text):
+    first, _, last = text.partition('-')
+    first, last = int(first), int(last or first)
+    if first > last:
+        raise argparse.ArgumentTypeError(
+            'the range %d-%d ends before it starts' % (first, last))
+    return first, last
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Query the section assignments of all the elves.')
+    parser.add_argument(
+        'source_file', nargs='?', default='inputs/part_1_2.txt')
+    parser.add_argument(
+        '-s', '--section', type=int, action='append', default=[],
+        help='List the elves covering this section.')
+    parser.add_argument(
+        '-r', '--range', type=_section_range, action='append', default=[],
+        help='List the elves overlapping this range, as FIRST-LAST.')
+    parser.add_argument(
+        '-c', '--count', action='store_true',
+        help='Only count the elves, instead of listing them.')
+    parser.add_argument(
+        '-p', '--pairs', action='store_true',
+        help='Count the pairs of elves of the whole roster that overlap.')
+    args = parser.parse_args(argv)
+
+    index = AssignmentIndex.from_file(args.source_file)
+    queries = [(s, s) for s in args.section] + args.range
+    for first, last in queries:
+        what = 'section %d' % first if first == last else \
+            'sections %d-%d' % (first, last)
+        if args.count:
+            print('%s: %d elves' % (
+                what, index.count_overlapping(first, last)))
+        else:
+            elves = index.overlapping(first, last)
+            print('%s: %d elves' % (what, len(elves)))
+            for elf in elves:
+                print('  %s' % _elf(index, elf))
+    if args.pairs:
+        print('%d pairs of the %d elves overlap' % (
+            index.count_overlapping_pairs(), len(index)))
+
+
+if __name__ == '__main__':
+    main()
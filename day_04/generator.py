@@ -0,0 +1,14 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import random
+
+
+def generate(out, size, seed=0, max_section=99):
+    """Write `size` pairs of section assignments to the file `out`"""
+    rng = random.Random(seed)
+    for _ in range(size):
+        sections = []
+        for _ in range(2):
+            start = rng.randint(1, max_section)
+            sections.append((start, rng.randint(start, max_section)))
+        out.write('%d-%d,%d-%d\n' % (*sections[0], *sections[1]))
@@ -1,15 +1,22 @@
 # Authored by Carlos Serra-Toro (https://carlosserratoro.com)
 # See the file LICENSE for the licence
-import os
+import operator
+
+from aoc.lines import iter_lines
+from aoc.mapreduce import map_reduce
+from sections import iter_sections
+
+
+def parse_ranges_data(lines):
+    for line in lines:
+        ranges_str = line.split(b',')
+        first_range = tuple(map(int, ranges_str[0].split(b'-')))
+        second_range = tuple(map(int, ranges_str[1].split(b'-')))
+        yield first_range, second_range
 
 
 def get_ranges_data(source_file):
-    with open(source_file) as f:
-        for line in f:
-            ranges_str = line.rstrip(os.linesep).split(',')
-            first_range = tuple(map(int, ranges_str[0].split('-')))
-            second_range = tuple(map(int, ranges_str[1].split('-')))
-            yield first_range, second_range
+    return parse_ranges_data(iter_lines(source_file))
 
 
 def ranges_overlap(a, b):
@@ -24,5 +31,30 @@ def get_num_of_overlaps(ranges_data):
     return res
 
 
+def count_overlaps(a_start, a_end, b_start, b_end):
+    """Count the pairs of ranges that overlap
+
+    This is `ranges_overlap` for the columns of many pairs at once, as
+    `sections.parse_sections` gives them: the comparisons are mapped
+    over the packed columns, so the loop is in C.
+
+    >>> count_overlaps([2, 5, 2], [4, 7, 3], [6, 7, 4], [8, 9, 5])
+    1
+    """
+    return sum(map(operator.and_,
+                   map(operator.le, a_start, b_end),
+                   map(operator.le, b_start, a_end)))
+
+
+def get_num_of_overlaps_in_chunk(source_file, start, end):
+    return sum(count_overlaps(*columns)
+               for columns in iter_sections(source_file, start, end))
+
+
+def solve(source_file, jobs=1):
+    return map_reduce(
+        source_file, get_num_of_overlaps_in_chunk, operator.add, jobs=jobs)
+
+
 if __name__ == '__main__':
-    print(get_num_of_overlaps(get_ranges_data('inputs/part_1_2.txt')))
+    print(solve('inputs/part_1_2.txt'))
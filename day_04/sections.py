@@ -0,0 +1,48 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+from array import array
+
+from aoc.lines import NEWLINE, iter_blocks, mapped
+
+
+# Each line is a pair of ranges of sections, `a-b,c-d`, so 4 numbers.
+NUMBERS_PER_LINE = 4
+
+# Turns the separators between the numbers of a line into whitespace, so
+# that a block of lines is split into its numbers at once.
+SEPARATORS = bytes.maketrans(b'-,', b'  ')
+
+
+def parse_sections(block):
+    """Parse the ranges of a block of bytes lines, as 4 columns of numbers
+
+    The columns are the starts and ends of the first ranges and the
+    starts and ends of the second ranges, each a packed `array` with a
+    number per line. The block is split into its numbers with a single
+    `split()` and they are all parsed into one array with `map()`, so
+    nothing is done a line at a time in Python, and no tuple nor list
+    is made per line.
+
+    >>> a_start, a_end, b_start, b_end = parse_sections(b'2-4,6-8\\n2-3,4-5')
+    >>> a_start, b_end
+    (array('q', [2, 2]), array('q', [8, 5]))
+    """
+    numbers = block.translate(SEPARATORS).split()
+    num_lines = block.count(NEWLINE) + 1
+    if len(numbers) != NUMBERS_PER_LINE * num_lines:
+        raise ValueError(
+            'Not %d numbers in each of the %d lines of the block' % (
+                NUMBERS_PER_LINE, num_lines))
+    numbers = array('q', map(int, numbers))
+    return tuple(
+        numbers[i::NUMBERS_PER_LINE] for i in range(NUMBERS_PER_LINE))
+
+
+def iter_sections(source_file, start=0, end=None):
+    """Yield the columns of the ranges of each block of lines of a file
+
+    Only the lines between the offsets `start` and `end` are parsed.
+    """
+    with mapped(source_file) as buf:
+        for block_start, block_end in iter_blocks(buf, start, end):
+            yield parse_sections(buf[block_start:block_end])
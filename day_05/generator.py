@@ -0,0 +1,38 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import random
+import string
+
+
+def generate(out, size, seed=0, num_stacks=9, max_height=50):
+    """Write a layout of crates and `size` moves to the file `out`
+
+    The heights of the stacks are tracked while generating the moves, so
+    that no move takes more crates than there are in the stack, and no
+    stack is ever left empty, as then it would have no top.
+    """
+    rng = random.Random(seed)
+    stacks = [
+        rng.choices(string.ascii_uppercase, k=rng.randint(2, max_height))
+        for _ in range(num_stacks)
+    ]
+
+    # The layout goes from top to bottom, with all lines of full width.
+    for level in range(max(map(len, stacks)) - 1, -1, -1):
+        out.write(' '.join(
+            '[%s]' % stack[level] if level < len(stack) else '   '
+            for stack in stacks
+        ) + '\n')
+    out.write(' '.join(' %d ' % (i + 1) for i in range(num_stacks)) + '\n')
+    out.write('\n')
+
+    heights = [len(stack) for stack in stacks]
+    for _ in range(size):
+        from_stack = rng.choice([i for i, h in enumerate(heights) if h > 1])
+        to_stack = rng.choice(
+            [i for i in range(num_stacks) if i != from_stack])
+        num_crates = rng.randint(1, heights[from_stack] - 1)
+        heights[from_stack] -= num_crates
+        heights[to_stack] += num_crates
+        out.write('move %d from %d to %d\n' %
+                  (num_crates, from_stack + 1, to_stack + 1))
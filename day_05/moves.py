@@ -0,0 +1,59 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+from array import array
+
+from aoc.lines import NEWLINE, iter_blocks, mapped
+
+
+# Each move is a line `move N from A to B`, so 6 words, every other one
+# a number.
+WORDS_PER_MOVE = 6
+
+# The blank line between the layout and the moves.
+LAYOUT_END = b'\n\n'
+
+
+def find_moves(buf):
+    """The offset of the first move, just after the blank line
+
+    >>> find_moves(b'[A]\\n 1 \\n\\nmove 1 from 1 to 1\\n')
+    9
+    """
+    layout_end = buf.find(LAYOUT_END)
+    return len(buf) if layout_end < 0 else layout_end + len(LAYOUT_END)
+
+
+def parse_moves(block):
+    """Parse the moves of a block of bytes lines, as 3 columns of numbers
+
+    The columns are the number of crates, and the stacks they are moved
+    from and to, each a packed `array` with a number per move. The block
+    is split into its words with a single `split()`, and every other one
+    is parsed into one array with `map()`, so nothing is done a line at
+    a time in Python, and no regex nor string is made per line.
+
+    >>> parse_moves(b'move 1 from 2 to 1\\nmove 13 from 1 to 3')
+    (array('q', [1, 13]), array('q', [2, 1]), array('q', [1, 3]))
+    """
+    words = block.split()
+    num_lines = block.count(NEWLINE) + 1
+    if len(words) != WORDS_PER_MOVE * num_lines:
+        raise ValueError(
+            'Not %d words in each of the %d moves of the block' % (
+                WORDS_PER_MOVE, num_lines))
+    numbers = array('q', map(int, words[1::2]))
+    return numbers[0::3], numbers[1::3], numbers[2::3]
+
+
+def read_layout(source_file):
+    """The lines of the layout of the crates, with their newlines"""
+    with mapped(source_file) as buf:
+        layout = buf[:find_moves(buf)]
+    return layout.decode('ascii').splitlines(keepends=True)
+
+
+def iter_moves(source_file):
+    """Yield the columns of the moves of each block of lines of a file"""
+    with mapped(source_file) as buf:
+        for block_start, block_end in iter_blocks(buf, find_moves(buf)):
+            yield parse_moves(buf[block_start:block_end])
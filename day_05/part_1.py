@@ -1,9 +1,11 @@
 # Authored by Carlos Serra-Toro (https://carlosserratoro.com)
 # See the file LICENSE for the licence
 import os
-import re
 from collections import deque
 
+from moves import iter_moves, read_layout
+from stacks import CrateStack
+
 
 def get_lines(source_file):
     with open(source_file) as f:
@@ -47,10 +49,12 @@ def create_stack_layout(stacks, line):
 
 def modify_stack_layout(stacks, line):
     """Modify the `stack` layouts by applying operation in `line`"""
-    num_ops, from_stack, to_stack = map(int, re.findall(r'\d+', line))
-    for _ in range(num_ops):
-        item = stacks[from_stack - 1].pop()
-        stacks[to_stack - 1].append(item)
+    # The numbers are every other word: move N from A to B.
+    num_ops, from_stack, to_stack = map(int, line.split()[1::2])
+    # Each operation moves 1 crate, so the top `num_ops` crates end up
+    # upside down, which the stacks do at once whatever their number.
+    stacks[from_stack - 1].move(
+        num_ops, stacks[to_stack - 1], one_at_a_time=True)
 
 
 def get_tops(lines):
@@ -61,6 +65,7 @@ def get_tops(lines):
     # from top to bottom. We could invert the queue but the
     # deque allows us to add/remove in O(1) from both sides.
     stacks = []
+    moving = False
 
     # Here it is key to make this efficient, taking advantage
     # of what we know: we will be given first the layout, then
@@ -75,6 +80,12 @@ def get_tops(lines):
         # the always start with the word 'move'. Being the
         # most common ones, we process them first to save jumps.
         if line and line[0] == 'm':
+            if not moving:
+                # The layout is complete by the first operation, so the
+                # deques it was built in are turned into stacks that
+                # move any number of crates at once.
+                stacks = [CrateStack(stack) for stack in stacks]
+                moving = True
             modify_stack_layout(stacks, line)
 
         # Lines defining the layout are non-empty lines that
@@ -96,5 +107,32 @@ def get_tops(lines):
     return ''.join(tops)
 
 
+def get_stacks(layout_lines):
+    """Return the stacks of the layout, ready to move crates"""
+    stacks = []
+    for line in layout_lines:
+        # Neither the blank line nor the line numbering the stacks.
+        if line.strip() and line[1] != '1':
+            create_stack_layout(stacks, line)
+    return [CrateStack(stack) for stack in stacks]
+
+
+def apply_moves(stacks, moves):
+    """Apply the moves, given in columns as `moves.parse_moves` does"""
+    for num_crates_column, from_column, to_column in moves:
+        for num_crates, from_stack, to_stack in zip(
+                num_crates_column, from_column, to_column):
+            stacks[from_stack - 1].move(
+                num_crates, stacks[to_stack - 1], one_at_a_time=True)
+
+
+def solve(source_file):
+    # The moves are decoded a block at a time straight from the file,
+    # instead of a line at a time as `get_tops` does.
+    stacks = get_stacks(read_layout(source_file))
+    apply_moves(stacks, iter_moves(source_file))
+    return ''.join(stack[-1] for stack in stacks)
+
+
 if __name__ == '__main__':
-    print(get_tops(get_lines('inputs/part_1_2.txt')))
+    print(solve('inputs/part_1_2.txt'))
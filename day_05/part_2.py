@@ -1,9 +1,11 @@
 # Authored by Carlos Serra-Toro (https://carlosserratoro.com)
 # See the file LICENSE for the licence
 import os
-import re
 from collections import deque
 
+from moves import iter_moves, read_layout
+from stacks import CrateStack
+
 
 def get_lines(source_file):
     with open(source_file) as f:
@@ -53,17 +55,12 @@ def modify_stack_layout(stacks, line):
     we always have 1 operation that moves the top-N items from the
     top of the stack, in order.
     """
-    num_items, from_stack, to_stack = map(int, re.findall(r'\d+', line))
+    # The numbers are every other word: move N from A to B.
+    num_items, from_stack, to_stack = map(int, line.split()[1::2])
 
-    # We use an intermediate stack to make the move in order. Here
-    # we can use a normal Python list because we just want to push
-    # and pop.
-    intermediate_stack = []
-    for _ in range(num_items):
-        item = stacks[from_stack - 1].pop()
-        intermediate_stack.append(item)
-    for _ in range(num_items):
-        stacks[to_stack - 1].append(intermediate_stack.pop())
+    # The stacks move the top-N items at once, in order, instead of
+    # going through an intermediate stack one item at a time.
+    stacks[from_stack - 1].move(num_items, stacks[to_stack - 1])
 
 
 def get_tops(lines):
@@ -74,6 +71,7 @@ def get_tops(lines):
     # from top to bottom. We could invert the queue but the
     # deque allows us to add/remove in O(1) from both sides.
     stacks = []
+    moving = False
 
     # Here it is key to make this efficient, taking advantage
     # of what we know: we will be given first the layout, then
@@ -88,6 +86,12 @@ def get_tops(lines):
         # the always start with the word 'move'. Being the
         # most common ones, we process them first to save jumps.
         if line and line[0] == 'm':
+            if not moving:
+                # The layout is complete by the first operation, so the
+                # deques it was built in are turned into stacks that
+                # move any number of crates at once.
+                stacks = [CrateStack(stack) for stack in stacks]
+                moving = True
             modify_stack_layout(stacks, line)
 
         # Lines defining the layout are non-empty lines that
@@ -109,5 +113,31 @@ def get_tops(lines):
     return ''.join(tops)
 
 
+def get_stacks(layout_lines):
+    """Return the stacks of the layout, ready to move crates"""
+    stacks = []
+    for line in layout_lines:
+        # Neither the blank line nor the line numbering the stacks.
+        if line.strip() and line[1] != '1':
+            create_stack_layout(stacks, line)
+    return [CrateStack(stack) for stack in stacks]
+
+
+def apply_moves(stacks, moves):
+    """Apply the moves, given in columns as `moves.parse_moves` does"""
+    for num_crates_column, from_column, to_column in moves:
+        for num_crates, from_stack, to_stack in zip(
+                num_crates_column, from_column, to_column):
+            stacks[from_stack - 1].move(num_crates, stacks[to_stack - 1])
+
+
+def solve(source_file):
+    # The moves are decoded a block at a time straight from the file,
+    # instead of a line at a time as `get_tops` does.
+    stacks = get_stacks(read_layout(source_file))
+    apply_moves(stacks, iter_moves(source_file))
+    return ''.join(stack[-1] for stack in stacks)
+
+
 if __name__ == '__main__':
-    print(get_tops(get_lines('inputs/part_1_2.txt')))
+    print(solve('inputs/part_1_2.txt'))
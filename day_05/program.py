@@ -0,0 +1,201 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import argparse
+from array import array
+from itertools import chain
+
+from moves import iter_moves, read_layout
+from part_1 import get_stacks
+from stacks import CrateStack
+
+
+# Moves between snapshots of the layout, by default.
+DEFAULT_SNAPSHOT_EVERY = 1000
+
+
+def fuse_moves(moves, one_at_a_time=False):
+    """Fuse the moves that cancel out or add up, as a list of fewer moves
+
+    Moves are `(num_crates, from_stack, to_stack)`, and each one is
+    fused with the last one kept, as long as it can be:
+
+    - Moving no crate, or moving crates onto the stack they are on,
+      does nothing, whether in order or one at a time.
+    - Moving N crates from A to B and then N from B to A puts them back
+      as they were, whether in order or one at a time.
+    - One at a time, moving N from A to B and then M from B to A is the
+      same as moving N - M from A to B (or M - N from B to A), and
+      moving N and then M from A to B is moving N + M.
+
+    Once a move is cancelled out, the one before it can be fused with
+    the next one, which is why the moves kept are a stack.
+
+    >>> fuse_moves([(2, 1, 3), (1, 2, 1), (1, 1, 2), (2, 3, 1)])
+    []
+    >>> fuse_moves([(3, 1, 2), (1, 2, 1), (4, 1, 2)], one_at_a_time=True)
+    [(6, 1, 2)]
+    >>> fuse_moves([(3, 1, 2), (1, 2, 1)])
+    [(3, 1, 2), (1, 2, 1)]
+    >>> fuse_moves([(2, 1, 1), (1, 3, 3)], one_at_a_time=True)
+    []
+    """
+    fused = []
+    for num_crates, from_stack, to_stack in moves:
+        if num_crates == 0 or from_stack == to_stack:
+            continue
+        while fused:
+            last_num_crates, last_from, last_to = fused[-1]
+            back = last_from == to_stack and last_to == from_stack
+            if back and last_num_crates == num_crates:
+                fused.pop()
+                num_crates = 0
+                break
+            # Only the moves one at a time add up, as moving N and then M
+            # crates in order does not put the M crates under the N.
+            if not one_at_a_time:
+                break
+            if back:
+                fused.pop()
+                if last_num_crates > num_crates:
+                    num_crates = last_num_crates - num_crates
+                    from_stack, to_stack = last_from, last_to
+                else:
+                    num_crates -= last_num_crates
+            elif last_from == from_stack and last_to == to_stack:
+                fused.pop()
+                num_crates += last_num_crates
+            else:
+                break
+        if num_crates:
+            fused.append((num_crates, from_stack, to_stack))
+    return fused
+
+
+class CraneProgram:
+    """A list of moves compiled for a layout, to get the tops at any move
+
+    The moves are run once, `snapshot_every` moves at a time, each time
+    fused with `fuse_moves` and followed by a snapshot of the layout.
+    The tops after the move `k` are then those of the last snapshot
+    before it, with at most `snapshot_every` moves after it run again,
+    instead of all the `k` moves from the start.
+
+    >>> program = CraneProgram(
+    ...     ['ZN', 'MCD', 'P'], [(1, 2, 1), (3, 1, 3), (2, 2, 1), (1, 1, 2)],
+    ...     snapshot_every=2)
+    >>> program.tops_after(0), program.tops_after(1), program.tops()
+    ('NDP', 'DCP', 'MCD')
+    >>> program.num_moves, program.num_fused_moves
+    (4, 4)
+    """
+
+    def __init__(self, layout, moves, one_at_a_time=False,
+                 snapshot_every=DEFAULT_SNAPSHOT_EVERY):
+        if snapshot_every < 1:
+            raise ValueError('Cannot snapshot every %d moves' % snapshot_every)
+        self.one_at_a_time = one_at_a_time
+        self.snapshot_every = snapshot_every
+        # The moves as they are, packed, to run them again from any of
+        # the snapshots.
+        self.moves = array('q')
+        for move in moves:
+            self.moves.extend(move)
+
+        stacks = [CrateStack(crates) for crates in layout]
+        self.snapshots = [self._snapshot(stacks)]
+        self.num_fused_moves = 0
+        for start in range(0, self.num_moves, snapshot_every):
+            fused = fuse_moves(
+                self._moves_between(start, start + snapshot_every),
+                one_at_a_time)
+            self._run(stacks, fused)
+            self.num_fused_moves += len(fused)
+            self.snapshots.append(self._snapshot(stacks))
+
+    @classmethod
+    def from_file(cls, source_file, one_at_a_time=False,
+                  snapshot_every=DEFAULT_SNAPSHOT_EVERY):
+        """Compile the moves of a file for its layout"""
+        layout = get_stacks(read_layout(source_file))
+        moves = chain.from_iterable(
+            zip(*columns) for columns in iter_moves(source_file))
+        return cls(layout, moves, one_at_a_time, snapshot_every)
+
+    @property
+    def num_moves(self):
+        return len(self.moves) // 3
+
+    @staticmethod
+    def _snapshot(stacks):
+        # A crate is a letter, so a stack is the string of its letters.
+        return tuple(''.join(stack) for stack in stacks)
+
+    def _moves_between(self, start, end):
+        moves = self.moves[3 * start:3 * end]
+        return zip(moves[0::3], moves[1::3], moves[2::3])
+
+    def _run(self, stacks, moves):
+        for num_crates, from_stack, to_stack in moves:
+            stacks[from_stack - 1].move(
+                num_crates, stacks[to_stack - 1], self.one_at_a_time)
+
+    def stacks_after(self, num_moves):
+        """The stacks after the first `num_moves` moves, in O(M) moves"""
+        if not 0 <= num_moves <= self.num_moves:
+            raise IndexError('No move %d in a program of %d moves' % (
+                num_moves, self.num_moves))
+        num_snapshot, num_left = divmod(num_moves, self.snapshot_every)
+        stacks = [CrateStack(crates)
+                  for crates in self.snapshots[num_snapshot]]
+        start = num_moves - num_left
+        self._run(stacks, fuse_moves(
+            self._moves_between(start, num_moves), self.one_at_a_time))
+        return stacks
+
+    def tops_after(self, num_moves):
+        """The top of each stack after the first `num_moves` moves"""
+        if num_moves == self.num_moves:
+            return self.tops()
+        if 0 <= num_moves and num_moves % self.snapshot_every == 0:
+            # No need to build the stacks, the snapshot has the tops.
+            return _tops(self.snapshots[num_moves // self.snapshot_every])
+        return _tops(self.stacks_after(num_moves))
+
+    def tops(self):
+        """The top of each stack after all the moves"""
+        return _tops(self.snapshots[-1])
+
+
+def _tops(stacks):
+    # Stacks can be left empty halfway through, then with a blank top.
+    return ''.join(stack[-1] if len(stack) else ' ' for stack in stacks)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Get the tops of the stacks after some of the moves.')
+    parser.add_argument(
+        'source_file', nargs='?', default='inputs/part_1_2.txt')
+    parser.add_argument(
+        '-k', '--moves', type=int, action='append', default=[],
+        help='Get the tops after this many moves, after all if not given.')
+    parser.add_argument(
+        '-p', '--part', type=int, choices=(1, 2), default=1,
+        help='Move crates one at a time as in part 1, or in order.')
+    parser.add_argument(
+        '-e', '--snapshot-every', type=int, default=DEFAULT_SNAPSHOT_EVERY,
+        help='Moves between snapshots of the layout.')
+    args = parser.parse_args(argv)
+
+    program = CraneProgram.from_file(
+        args.source_file, one_at_a_time=args.part == 1,
+        snapshot_every=args.snapshot_every)
+    print('%d moves, %d once fused, %d snapshots' % (
+        program.num_moves, program.num_fused_moves, len(program.snapshots)))
+    for num_moves in args.moves or [program.num_moves]:
+        print('after %d moves: %s' % (
+            num_moves, program.tops_after(num_moves)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import random
+
+
+class _Node:
+    """A crate in the tree of a stack, and the crates under it in the tree
+
+    `size` is the number of crates in the subtree, and `flipped` whether
+    the crates of the subtree are yet to be put upside down, which is
+    done lazily: only when going down the tree through the node.
+    """
+
+    __slots__ = ('crate', 'priority', 'size', 'left', 'right', 'flipped')
+
+    def __init__(self, crate, priority):
+        self.crate = crate
+        self.priority = priority
+        self.size = 1
+        self.left = None
+        self.right = None
+        self.flipped = False
+
+
+def _push(node):
+    """Put the children of the node upside down, if they are to be"""
+    if node.flipped:
+        node.left, node.right = node.right, node.left
+        if node.left is not None:
+            node.left.flipped = not node.left.flipped
+        if node.right is not None:
+            node.right.flipped = not node.right.flipped
+        node.flipped = False
+
+
+def _size(node):
+    return node.size if node is not None else 0
+
+
+def _split(node, num_bottom):
+    """Split the crates of the tree into the bottom `num_bottom` and the rest
+
+    Returns the roots of both trees, going down a single path.
+    """
+    if node is None:
+        return None, None
+    _push(node)
+    num_left = _size(node.left)
+    if num_bottom <= num_left:
+        bottom, node.left = _split(node.left, num_bottom)
+        node.size -= _size(bottom)
+        return bottom, node
+    node.right, top = _split(node.right, num_bottom - num_left - 1)
+    node.size -= _size(top)
+    return node, top
+
+
+def _merge(bottom, top):
+    """Put the crates of the tree `top` on the tree `bottom`, as one tree"""
+    if bottom is None:
+        return top
+    if top is None:
+        return bottom
+    size = bottom.size + top.size
+    if bottom.priority > top.priority:
+        _push(bottom)
+        bottom.right = _merge(bottom.right, top)
+        bottom.size = size
+        return bottom
+    _push(top)
+    top.left = _merge(bottom, top.left)
+    top.size = size
+    return top
+
+
+class CrateStack:
+    """A stack of crates that moves any number of them in O(log n)
+
+    The crates are kept in a treap, a binary tree whose in-order is the
+    stack from the bottom to the top and where each crate has a random
+    priority lower than that of its parent, which keeps the tree about
+    O(log n) deep. Taking the top `n` crates is splitting the tree, and
+    putting them on another stack is merging both trees, each down a
+    single path. Putting them upside down, as moving them one at a time
+    does, just flags the root of their tree, as `_Node` explains.
+
+    >>> a, b = CrateStack('ZN'), CrateStack('MCD')
+    >>> a.move(2, b, one_at_a_time=True)
+    >>> ''.join(a), ''.join(b), b[-1]
+    ('', 'MCDNZ', 'Z')
+    >>> b.move(3, a)
+    >>> ''.join(a), ''.join(b), a[-1]
+    ('DNZ', 'MC', 'Z')
+    """
+
+    def __init__(self, crates=(), rng=random):
+        self._rng = rng
+        self._root = self._build(crates)
+
+    def _build(self, crates):
+        """The treap of the crates, from the bottom, in O(n)
+
+        Crates are added on the right of the tree, taking as their left
+        subtree the crates of the right spine with lower priorities.
+        """
+        rng = self._rng.random
+        spine = []
+        for crate in crates:
+            node = _Node(crate, rng())
+            last = None
+            while spine and spine[-1].priority < node.priority:
+                last = spine.pop()
+            node.left = last
+            if spine:
+                spine[-1].right = node
+            spine.append(node)
+        if not spine:
+            return None
+        # The sizes, from the leaves up, once the tree is complete.
+        order = [spine[0]]
+        for node in order:
+            order.extend(c for c in (node.left, node.right) if c is not None)
+        for node in reversed(order):
+            node.size = 1 + _size(node.left) + _size(node.right)
+        return spine[0]
+
+    def __len__(self):
+        return _size(self._root)
+
+    def __iter__(self):
+        """The crates from the bottom to the top"""
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            if node is not None:
+                _push(node)
+                stack.append(node)
+                node = node.left
+            else:
+                node = stack.pop()
+                yield node.crate
+                node = node.right
+
+    def __getitem__(self, index):
+        """The crate at `index` from the bottom, or from the top if < 0"""
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('No crate %d in a stack of %d' % (index, size))
+        node = self._root
+        while True:
+            _push(node)
+            num_left = _size(node.left)
+            if index < num_left:
+                node = node.left
+            elif index == num_left:
+                return node.crate
+            else:
+                index -= num_left + 1
+                node = node.right
+
+    def take(self, num_crates, one_at_a_time=False):
+        """Take the top `num_crates` off the stack, as a stack of their own
+
+        Taken `one_at_a_time`, they end up upside down.
+        """
+        taken = CrateStack(rng=self._rng)
+        taken._root = self._take(num_crates, one_at_a_time)
+        return taken
+
+    def _take(self, num_crates, one_at_a_time):
+        size = _size(self._root)
+        if num_crates > size:
+            raise IndexError('Cannot take %d crates from a stack of %d' % (
+                num_crates, size))
+        self._root, top = _split(self._root, size - num_crates)
+        if one_at_a_time and top is not None:
+            top.flipped = not top.flipped
+        return top
+
+    def put(self, other):
+        """Put all the crates of the stack `other` on this one"""
+        if other is self:
+            return
+        self._root = _merge(self._root, other._root)
+        other._root = None
+
+    def move(self, num_crates, to_stack, one_at_a_time=False):
+        """Move the top `num_crates` to the top of `to_stack`
+
+        Moving crates onto the stack they are on leaves them as they
+        are, even one at a time, as each crate is put back right away.
+
+        >>> stack = CrateStack('ABC')
+        >>> stack.move(2, stack, one_at_a_time=True)
+        >>> ''.join(stack)
+        'ABC'
+        """
+        if to_stack is self:
+            if num_crates > len(self):
+                raise IndexError(
+                    'Cannot take %d crates from a stack of %d' % (
+                        num_crates, len(self)))
+            return
+        top = self._take(num_crates, one_at_a_time)
+        to_stack._root = _merge(to_stack._root, top)
@@ -0,0 +1,19 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import random
+import string
+
+
+def generate(out, size, seed=0, marker_size=14):
+    """Write a signal of `size` characters to the file `out`
+
+    The signal is made of just three different characters but for its
+    end, which is the only place with `marker_size` different characters
+    in a row. That is the worst case, as the whole signal must be read
+    to find the markers.
+    """
+    rng = random.Random(seed)
+    body_size = max(size - marker_size, 0)
+    out.write(''.join(rng.choices('abc', k=body_size)))
+    out.write(''.join(rng.sample(string.ascii_lowercase, marker_size)))
+    out.write('\n')
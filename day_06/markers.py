@@ -0,0 +1,206 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import argparse
+import sys
+
+from aoc.lines import BLOCK_SIZE, NEWLINE
+
+
+def find_marker(signal, marker_size):
+    """Get the number of characters read to find the first marker
+
+    A marker is `marker_size` different characters in a row, and -1 is
+    returned if there is none. The signal is scanned once, keeping where
+    the window of different characters ending at each position starts:
+    when a character is already in the window, it starts again just
+    after it. Where each character was last seen is kept in a table of
+    256 slots, indexed by the byte of the character, so this takes O(n)
+    for any size of marker, with nothing allocated per character.
+
+    Characters are bytes, so a signal given as a string is encoded as
+    Latin-1 first.
+
+    >>> find_marker('mjqjpqmgbljsphdztnvjfqwrcgsmlb', 4)
+    7
+    >>> find_marker(b'mjqjpqmgbljsphdztnvjfqwrcgsmlb', 14)
+    19
+    >>> find_marker('abcabc', 4)
+    -1
+    """
+    if isinstance(signal, str):
+        signal = signal.encode('latin-1')
+    last_seen = [-1] * 256
+    window_start = 0
+    for i, char in enumerate(signal):
+        if last_seen[char] >= window_start:
+            window_start = last_seen[char] + 1
+        last_seen[char] = i
+        if i - window_start + 1 == marker_size:
+            return i + 1
+    return -1
+
+
+class MarkerScanner:
+    """Finds the markers of several sizes in a signal given in chunks
+
+    This is `find_marker` for all the sizes at once, with its state kept
+    between chunks, so the signal is never in memory as a whole: the
+    window of different characters ending at a position is a marker of
+    every size up to its length, and as the window grows by one at most
+    with each character, the first markers are found from the shortest.
+
+    Only the first marker of each size is found, unless `find_all` is
+    set, and then `feed` gives every marker, ending at every position.
+    Positions are the number of characters read, from the start of the
+    signal, to find each marker.
+
+    >>> scanner = MarkerScanner([4, 14])
+    >>> scanner.feed(b'mjqjpqmgbljsph'), scanner.feed(b'dztnvjfqwrcgsmlb')
+    ([(4, 7)], [(14, 19)])
+    >>> scanner.first_markers, scanner.done
+    ({4: 7, 14: 19}, True)
+    >>> MarkerScanner([2, 3], find_all=True).feed(b'abba')
+    [(2, 2), (2, 4)]
+    """
+
+    def __init__(self, marker_sizes, find_all=False):
+        self.marker_sizes = sorted(set(marker_sizes))
+        if not self.marker_sizes or self.marker_sizes[0] < 1:
+            raise ValueError('Markers must be at least 1 character long')
+        self.find_all = find_all
+        self.first_markers = dict.fromkeys(self.marker_sizes, -1)
+        self.position = 0
+        self._num_found = 0
+        self._last_seen = [-1] * 256
+        self._window_start = 0
+
+    @property
+    def done(self):
+        """Whether there is nothing left to find in the signal"""
+        return (not self.find_all and
+                self._num_found == len(self.marker_sizes))
+
+    def feed(self, chunk):
+        """Scan the next chunk of bytes, and return the markers found
+
+        Markers are `(marker_size, position)`, by position and size.
+        """
+        found = []
+        chunk_end = self.position + len(chunk)
+        if self.done:
+            self.position = chunk_end
+            return found
+
+        sizes = self.marker_sizes
+        first_markers = self.first_markers
+        num_found = self._num_found
+        last_seen = self._last_seen
+        window_start = self._window_start
+        position = self.position
+        # The length of the window from which there are markers to find.
+        min_length = sizes[0] if self.find_all else sizes[num_found]
+        for char in chunk:
+            seen = last_seen[char]
+            if seen >= window_start:
+                window_start = seen + 1
+            last_seen[char] = position
+            position += 1
+            length = position - window_start
+            if length < min_length:
+                continue
+            if self.find_all:
+                for size in sizes:
+                    if size > length:
+                        break
+                    found.append((size, position))
+                    if first_markers[size] < 0:
+                        first_markers[size] = position
+                        num_found += 1
+            else:
+                size = sizes[num_found]
+                first_markers[size] = position
+                found.append((size, position))
+                num_found += 1
+                if num_found == len(sizes):
+                    break
+                min_length = sizes[num_found]
+
+        self._num_found = num_found
+        self._window_start = window_start
+        self.position = chunk_end
+        return found
+
+
+def scan_signals(stream, marker_sizes, on_marker=None,
+                 chunk_size=BLOCK_SIZE):
+    """Yield the first markers of each signal of a binary stream
+
+    Signals are lines, read `chunk_size` bytes at a time whatever their
+    length, so memory stays constant. The first markers of each signal
+    are given as `MarkerScanner.first_markers`. With `on_marker`, every
+    marker is also reported as it is found, with
+    `on_marker(num_signal, marker_size, position)`.
+    """
+    find_all = on_marker is not None
+    num_signal = 0
+    scanner = MarkerScanner(marker_sizes, find_all)
+
+    def feed(piece):
+        found = scanner.feed(piece)
+        if find_all:
+            for marker_size, position in found:
+                on_marker(num_signal, marker_size, position)
+
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        # Each newline ends a signal, and the last piece carries on.
+        pieces = chunk.split(NEWLINE)
+        for piece in pieces[:-1]:
+            feed(piece)
+            yield scanner.first_markers
+            num_signal += 1
+            scanner = MarkerScanner(marker_sizes, find_all)
+        feed(pieces[-1])
+    if scanner.position:  # The last signal, with no newline after it.
+        yield scanner.first_markers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Find the markers of the signals of a file, or of the '
+                    'standard input, in one pass.')
+    parser.add_argument(
+        'source_file', nargs='?', default='inputs/part_1_2.txt',
+        help="The file of signals, or '-' for the standard input.")
+    parser.add_argument(
+        '-s', '--size', type=int, action='append', dest='sizes',
+        help='Find markers of this size, by default 4 and 14.')
+    parser.add_argument(
+        '-a', '--all', action='store_true',
+        help='Print all the markers, not only the first of each size.')
+    args = parser.parse_args(argv)
+    sizes = args.sizes or [4, 14]
+
+    def print_marker(num_signal, marker_size, position):
+        print('signal %d: marker of %d at %d' % (
+            num_signal + 1, marker_size, position))
+
+    def print_first_markers(stream):
+        signals = scan_signals(
+            stream, sizes, print_marker if args.all else None)
+        for num_signal, first_markers in enumerate(signals, start=1):
+            print('signal %d: %s' % (num_signal, ', '.join(
+                'first marker of %d at %d' % marker
+                for marker in first_markers.items())))
+
+    if args.source_file == '-':
+        print_first_markers(sys.stdin.buffer)
+    else:
+        with open(args.source_file, 'rb') as f:
+            print_first_markers(f)
+
+
+if __name__ == '__main__':
+    main()
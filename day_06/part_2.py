@@ -2,6 +2,8 @@
 # See the file LICENSE for the licence
 import os
 
+from markers import find_marker, scan_signals
+
 
 START_OF_MSG_SIZE = 14
 
@@ -14,28 +16,7 @@ def get_lines(source_file):
 
 def _get_num_chars_to_process(line):
     """Get number of characters to find first start-of-message"""
-    i = 0
-    while i < len(line):
-        s = {line[i]}
-        repeated_not_found = True
-        j = 1
-        while (
-            i+j < len(line)
-            and j < START_OF_MSG_SIZE
-            and repeated_not_found
-        ):
-            if line[i+j] in s:
-                repeated_not_found = False
-            else:
-                s.add(line[i+j])
-            j += 1
-
-        if repeated_not_found:
-            return i + j
-        else:
-            i += 1
-
-    return -1
+    return find_marker(line, START_OF_MSG_SIZE)
 
 
 def get_num_chars_to_process(lines):
@@ -50,5 +31,12 @@ def get_num_chars_to_process(lines):
     return num_chars
 
 
+def solve(source_file):
+    # The signals are scanned a chunk at a time, however long they are.
+    with open(source_file, 'rb') as f:
+        return [first_markers[START_OF_MSG_SIZE]
+                for first_markers in scan_signals(f, [START_OF_MSG_SIZE])]
+
+
 if __name__ == '__main__':
-    print(get_num_chars_to_process(get_lines('inputs/part_1_2.txt')))
+    print(solve('inputs/part_1_2.txt'))
@@ -0,0 +1,42 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import random
+
+
+def generate(out, size, seed=0, deep=0.9, max_files=5):
+    """Write a terminal session exploring `size` directories to `out`
+
+    Each new directory hangs from the last one created with probability
+    `deep`, and from any other one otherwise, so the higher `deep` is
+    the deeper the tree of directories becomes. The sizes of the files
+    shrink as the number of directories grows, so that they always take
+    about 50000000 in total and part 2 has to free some space.
+    """
+    rng = random.Random(seed)
+    max_file_size = max(1, 4 * 50000000 // (size * max_files))
+    children = [[] for _ in range(size)]
+    for dir_no in range(1, size):
+        parent = dir_no - 1 if rng.random() < deep else rng.randrange(dir_no)
+        children[parent].append(dir_no)
+
+    # Traverse the tree without recursion, as it may be very deep.
+    out.write('$ cd /\n')
+    stack = [(0, None)]
+    while stack:
+        dir_no, child_it = stack.pop()
+        if child_it is None:
+            out.write('$ ls\n')
+            for child in children[dir_no]:
+                out.write('dir d%d\n' % child)
+            for file_no in range(rng.randint(0, max_files)):
+                file_size = rng.randint(1, max_file_size)
+                out.write('%d f%d\n' % (file_size, file_no))
+            child_it = iter(children[dir_no])
+        child = next(child_it, None)
+        if child is None:
+            if stack:
+                out.write('$ cd ..\n')
+        else:
+            out.write('$ cd d%d\n' % child)
+            stack.append((dir_no, child_it))
+            stack.append((child, None))
@@ -30,17 +30,17 @@ def build_fs(lines):
     return fs
 
 
-def part_1(fs):
-    threshold = 100000
+def part_1(fs, threshold=100000):
+    """Sum of sizes of the directories up to `threshold`"""
     sum_sizes = 0
     for node in fs:
         if node._is_dir and node._size < threshold:
             sum_sizes += node._size
-    print('Part 1: Sum of sizes of dirs up to %d: %d.' %
-          (threshold, sum_sizes))
+    return sum_sizes
 
 
 def part_2(fs):
+    """Total size of the smallest directory to remove"""
     total_space = 70000000
     required_unused_space = 30000000
     amount_to_free = required_unused_space - (total_space - fs._root._size)
@@ -49,12 +49,21 @@ def part_2(fs):
         if node._is_dir and node._size >= amount_to_free:
             if node._size < smallest_directory_size:
                 smallest_directory_size = node._size
-    print('Part 2: Total size of smallest directory to remove: %d' %
-          smallest_directory_size)
+    return smallest_directory_size
+
+
+def solve_part_1(source_file):
+    return part_1(build_fs(get_lines(source_file)))
+
+
+def solve_part_2(source_file):
+    return part_2(build_fs(get_lines(source_file)))
 
 
 if __name__ == '__main__':
     fs = build_fs(get_lines('inputs/part_1_2.txt'))
     print(fs)
-    part_1(fs)
-    part_2(fs)
+    print('Part 1: Sum of sizes of dirs up to %d: %d.' %
+          (100000, part_1(fs)))
+    print('Part 2: Total size of smallest directory to remove: %d' %
+          part_2(fs))
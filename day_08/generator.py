@@ -0,0 +1,10 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import random
+
+
+def generate(out, size, seed=0):
+    """Write a forest of `size` x `size` trees to the file `out`"""
+    rng = random.Random(seed)
+    for _ in range(size):
+        out.write(''.join(rng.choices('0123456789', k=size)) + '\n')
@@ -91,5 +91,9 @@ def get_num_trees_seen(file_path):
     return len(trees)
 
 
+def solve(source_file):
+    return get_num_trees_seen(source_file)
+
+
 if __name__ == '__main__':
-    print(get_num_trees_seen('inputs/part_1_2.txt'))
+    print(solve('inputs/part_1_2.txt'))
@@ -82,5 +82,9 @@ def get_highest_scenic_score(lines):
     return highest_scenic_score
 
 
+def solve(source_file):
+    return get_highest_scenic_score(get_lines(source_file))
+
+
 if __name__ == '__main__':
-    print(get_highest_scenic_score(get_lines('inputs/part_1_2.txt')))
+    print(solve('inputs/part_1_2.txt'))
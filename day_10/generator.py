@@ -0,0 +1,20 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import random
+
+
+def generate(out, size, seed=0):
+    """Write a program of `size` instructions to the file `out`
+
+    The values added to X pull it back towards the CRT, so the sprite
+    keeps being drawn for any length of the program.
+    """
+    rng = random.Random(seed)
+    x = 1
+    for _ in range(size):
+        if rng.random() < 0.3:
+            out.write('noop\n')
+        else:
+            value = rng.randint(-5, 5) + (20 - x) // 5
+            x += value
+            out.write('addx %d\n' % value)
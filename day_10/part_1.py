@@ -4,6 +4,10 @@ import os
 import re
 
 
+# Cycles whose signal strength is added up.
+AT_CYCLES = (20, 60, 100, 140, 180, 220)
+
+
 def get_instruction_lines(source_file):
     with open(source_file) as f:
         for line in f:
@@ -38,8 +42,12 @@ def compute_signal_strength(instructions, at_cycles):
     return signal_strength
 
 
+def solve(source_file, at_cycles=AT_CYCLES):
+    return compute_signal_strength(
+        instructions=get_instruction_lines(source_file),
+        at_cycles=at_cycles
+    )
+
+
 if __name__ == '__main__':
-    print(compute_signal_strength(
-        instructions=get_instruction_lines('inputs/part_1_2.txt'),
-        at_cycles=[20, 60, 100, 140, 180, 220]
-    ))
+    print(solve('inputs/part_1_2.txt'))
@@ -41,12 +41,22 @@ def compute_crt(instructions):
     return crt
 
 
+def crt_to_str(crt):
+    """Render the CRT according to the pixels to highlight"""
+    rows = []
+    for row in range(CRT_HEIGHT):
+        rows.append(''.join(
+            '#' if (row, col) in crt else '.' for col in range(CRT_WIDTH)))
+    return os.linesep.join(rows)
+
+
 def draw_crt(crt):
     """Draw the CRT according to the pixels to highlight"""
-    for row in range(CRT_HEIGHT):
-        for col in range(CRT_WIDTH):
-            print('#' if (row, col) in crt else '.', end='')
-        print()
+    print(crt_to_str(crt))
+
+
+def solve(source_file):
+    return crt_to_str(compute_crt(get_instruction_lines(source_file)))
 
 
 if __name__ == '__main__':
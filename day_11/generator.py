@@ -0,0 +1,40 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import random
+
+
+PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+
+
+def generate(out, size, seed=0, num_monkeys=8):
+    """Write monkeys holding `size` items in total to the file `out`
+
+    Monkeys are numbered with a single digit, as the parser expects, so
+    there are at most ten of them. Their divisors are different primes.
+    Only the first monkey squares the worry level, as otherwise worry
+    levels grow way too fast in part 1, where they are not bounded.
+    """
+    rng = random.Random(seed)
+    num_monkeys = max(2, min(num_monkeys, len(PRIMES)))
+    divisors = rng.sample(PRIMES, num_monkeys)
+    items = [[] for _ in range(num_monkeys)]
+    for _ in range(size):
+        items[rng.randrange(num_monkeys)].append(rng.randint(50, 99))
+
+    for monkey_no in range(num_monkeys):
+        if monkey_no == 0:
+            operation = 'old * old'
+        else:
+            operation = rng.choice(
+                ['old * %d' % rng.randint(2, 19),
+                 'old + %d' % rng.randint(1, 8)])
+        others = [m for m in range(num_monkeys) if m != monkey_no]
+        if monkey_no:
+            out.write('\n')
+        out.write('Monkey %d:\n' % monkey_no)
+        out.write('  Starting items: %s\n' %
+                  ', '.join(map(str, items[monkey_no])))
+        out.write('  Operation: new = %s\n' % operation)
+        out.write('  Test: divisible by %d\n' % divisors[monkey_no])
+        out.write('    If true: throw to monkey %d\n' % rng.choice(others))
+        out.write('    If false: throw to monkey %d\n' % rng.choice(others))
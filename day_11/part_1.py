@@ -3,10 +3,8 @@
 from monkeys import Monkeys
 
 
-def main():
+def solve(file_path, print_process=False):
     monkeys = Monkeys()
-    file_path = 'inputs/part_1_2.txt'
-    print_process = True
 
     # Part 1 relaxes the worry, runs for 20 rounds
     monkeys.build_from_file(file_path, print_after_build=print_process)
@@ -18,7 +16,11 @@ def main():
         num_rounds=20,
         relax_func=relax_worry,
         show_progress=print_process)
-    print('Part 1: ', monkeys.get_level_of_business())
+    return monkeys.get_level_of_business()
+
+
+def main():
+    print('Part 1: ', solve('inputs/part_1_2.txt', print_process=True))
 
 
 if __name__ == '__main__':
@@ -3,10 +3,8 @@
 from monkeys import Monkeys
 
 
-def main():
+def solve(file_path, print_process=False):
     monkeys = Monkeys()
-    file_path = 'inputs/part_1_2.txt'
-    print_process = True
 
     # Part 2 doesn't relax the worry *by default*, runs for 10000 rounds.
     #
@@ -42,7 +40,11 @@ def main():
         num_rounds=10000,
         relax_func=relax_worry,
         show_progress=print_process)
-    print('Part 2: ', monkeys.get_level_of_business())
+    return monkeys.get_level_of_business()
+
+
+def main():
+    print('Part 2: ', solve('inputs/part_1_2.txt', print_process=True))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,23 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import random
+
+
+def _packet(rng, depth):
+    elements = []
+    for _ in range(rng.randint(0, 5)):
+        if depth and rng.random() < 0.3:
+            elements.append(_packet(rng, depth - 1))
+        else:
+            elements.append(str(rng.randint(0, 10)))
+    return '[%s]' % ','.join(elements)
+
+
+def generate(out, size, seed=0, max_depth=4):
+    """Write `size` pairs of packets to the file `out`"""
+    rng = random.Random(seed)
+    for pair_no in range(size):
+        if pair_no:
+            out.write('\n')
+        out.write(_packet(rng, max_depth) + '\n')
+        out.write(_packet(rng, max_depth) + '\n')
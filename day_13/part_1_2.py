@@ -107,6 +107,14 @@ def part_2(pairs_data):
     return decoder_keys[0] * decoder_keys[1]
 
 
+def solve_part_1(file_path):
+    return part_1(get_pairs_of_lists(file_path))
+
+
+def solve_part_2(file_path):
+    return part_2(get_pairs_of_lists(file_path))
+
+
 if __name__ == '__main__':
     # Assertions and solution for Part 1:
     assert +1 == cmp([1, 1, 3, 1, 1], [1, 1, 5, 1, 1])
@@ -121,11 +129,13 @@ if __name__ == '__main__':
 
     assert 13 == part_1(get_pairs_of_lists('inputs/part_1_2_test.txt'))
 
-    print('Part 1: ', part_1(get_pairs_of_lists('inputs/part_1_2.txt')))
-    assert 5366 == part_1(get_pairs_of_lists('inputs/part_1_2.txt'))
+    solution_part_1 = part_1(get_pairs_of_lists('inputs/part_1_2.txt'))
+    print('Part 1: ', solution_part_1)
+    assert 5366 == solution_part_1
 
     # Assertions and solution for Part 2:
     assert 140 == part_2(get_pairs_of_lists('inputs/part_1_2_test.txt'))
 
-    print('Part 2: ', part_2(get_pairs_of_lists('inputs/part_1_2.txt')))
-    assert 23391 == part_2(get_pairs_of_lists('inputs/part_1_2.txt'))
+    solution_part_2 = part_2(get_pairs_of_lists('inputs/part_1_2.txt'))
+    print('Part 2: ', solution_part_2)
+    assert 23391 == solution_part_2
@@ -0,0 +1,52 @@
+# Authored by Carlos Serra-Toro (https://carlosserratoro.com)
+# See the file LICENSE for the licence
+import random
+
+
+def generate(out, size, seed=0, max_coord=4000000):
+    """Write `size` sensors and their closest beacons to the file `out`
+
+    The distress signal is picked first, anywhere from (0, 0) to
+    (`max_coord`, `max_coord`), and four sensors diagonally around it,
+    `max_coord + 1` away on each axis, cover all the other points up to
+    there: their diamonds reach just next to the signal, as the sensors
+    of the actual inputs do. The closest beacon of the two on the right
+    of the signal is the point just right of it, and that of the two on
+    the left the point just left of it, the only points of their
+    diamonds not in any other one.
+
+    The other sensors are anywhere in the square but on the column of
+    the signal, and their closest beacon is whichever of both is on
+    their side, which is always one closer than the signal. So no
+    sensor covers the signal, and no beacon is as close to a sensor as
+    its own one, which is the only one it can lock on to.
+    """
+    if size < 4:
+        raise ValueError(
+            'At least 4 sensors are needed around the distress signal, '
+            'not %d' % size)
+    rng = random.Random(seed)
+    signal_x = rng.randint(0, max_coord)
+    signal_y = rng.randint(0, max_coord)
+    beacon_left = (signal_x - 1, signal_y)
+    beacon_right = (signal_x + 1, signal_y)
+
+    away = max_coord + 1
+    sensors = [
+        (signal_x + dx * away, signal_y + dy * away)
+        for dx in (-1, 1)
+        for dy in (-1, 1)
+    ]
+    for _ in range(size - 4):
+        sensor_x = rng.randint(0, max_coord - 1)
+        if sensor_x >= signal_x:
+            sensor_x += 1
+        sensors.append((sensor_x, rng.randint(0, max_coord)))
+    rng.shuffle(sensors)
+
+    for sensor_x, sensor_y in sensors:
+        beacon_x, beacon_y = (
+            beacon_left if sensor_x < signal_x else beacon_right)
+        out.write(
+            'Sensor at x=%d, y=%d: closest beacon is at x=%d, y=%d\n' %
+            (sensor_x, sensor_y, beacon_x, beacon_y))
@@ -209,12 +209,14 @@ def get_tuning_frequency(circles, x_domain, y_domain):
         ranges_cover = []
         for c in circles:
             if c.center.y - c.radius <= y <= c.center.y + c.radius:
-                ranges_cover.append(
-                    limit_range(
-                        c.get_x(y),
-                        min_val=x_domain[0],
-                        max_val=x_domain[1])
-                )
+                r = limit_range(
+                    c.get_x(y),
+                    min_val=x_domain[0],
+                    max_val=x_domain[1])
+                # Circles of sensors out of the domain may cover the row
+                # only out of it, and then there is no range to add.
+                if r:
+                    ranges_cover.append(r)
         ranges_flat = ranges_flatten(ranges_cover)
 
         # Get those X coordinates not covered by any circle, if any.
@@ -229,6 +231,18 @@ def get_tuning_frequency(circles, x_domain, y_domain):
     return -1
 
 
+def solve_part_1(input_file, y=2000000):
+    circles, beacons = load_circles_beacons(input_file)
+    return get_num_x_coordinates_without_beacon(
+        y=y, circles=circles, beacons=beacons)
+
+
+def solve_part_2(input_file, max_coord=4000000):
+    circles, _ = load_circles_beacons(input_file)
+    return get_tuning_frequency(
+        circles=circles, x_domain=(0, max_coord), y_domain=(0, max_coord))
+
+
 def part_1():
     """Part 1 of Day 15"""
     circles_test, beacons_test = load_circles_beacons(